@@ -0,0 +1,75 @@
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.harness import compare
+from benchmarks.scraper_benchmarks import BROWSER_BENCHMARKS, HTTP_BENCHMARKS
+
+ALL_BENCHMARKS = list(BROWSER_BENCHMARKS) + list(HTTP_BENCHMARKS) + ["job_processor"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers and JobProcessor against local fixtures")
+    parser.add_argument("--only", nargs="+", choices=ALL_BENCHMARKS, help="benchmarks to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=20, help="pages per scraper benchmark")
+    parser.add_argument("--corpus-size", type=int, default=2000, help="synthetic job descriptions for job_processor")
+    parser.add_argument("--batch-size", type=int, default=64, help="job_processor batch size")
+    parser.add_argument("--no-headless", action="store_true", help="show the browser while benchmarking")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previous --output file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative drop in pages/sec (or rise in commands/page) against the baseline")
+    return parser.parse_args()
+
+
+def run(args):
+    selected = args.only or ALL_BENCHMARKS
+    results = []
+
+    with FixtureServer() as server:
+        http_selected = [name for name in selected if name in HTTP_BENCHMARKS]
+        if http_selected:
+            from linkedin_scraper.scraper.http_session import create_session
+            session = create_session(retries=0)
+            try:
+                for name in http_selected:
+                    results.append(HTTP_BENCHMARKS[name](session, server.base_url, args.iterations))
+            finally:
+                session.close()
+
+        browser_selected = [name for name in selected if name in BROWSER_BENCHMARKS]
+        if browser_selected:
+            from linkedin_scraper.scraper.driver_factory import create_driver
+            driver = create_driver(headless=not args.no_headless)
+            try:
+                for name in browser_selected:
+                    results.append(BROWSER_BENCHMARKS[name](driver, server.base_url, args.iterations))
+            finally:
+                driver.quit()
+
+    if "job_processor" in selected:
+        from benchmarks.processor_benchmark import bench_job_processor
+        results.append(bench_job_processor(args.corpus_size, args.batch_size))
+
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
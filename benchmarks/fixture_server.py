@@ -0,0 +1,80 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+JOB_VIEW_PATH = re.compile(r"^/jobs/view/(\d+)/?$")
+
+
+def fixture_for(url: str):
+    """Maps a request path onto the recorded page that stands in for it, or None for a 404."""
+    parts = urlsplit(url)
+    if parts.path == "/jobs/search" or parts.path == "/jobs/search/":
+        return "jobs_search.html"
+
+    # Job ids alternate between the two description layouts LinkedIn serves
+    match = JOB_VIEW_PATH.match(parts.path)
+    if match:
+        return "job_detail_description.html" if int(match.group(1)) % 2 == 0 else "job_detail_show_more.html"
+
+    if parts.path == "/Courses.cfm":
+        return "course_list.html" if "Subject=" in parts.query else "courses.html"
+    return None
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = {}
+
+    def do_GET(self):
+        fixture = fixture_for(self.path)
+        if fixture is None:
+            self.send_error(404)
+            return
+
+        body = self.pages[fixture]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Serves the recorded LinkedIn and Western calendar pages from benchmarks/fixtures on a local port, so the
+    scrapers can be benchmarked without touching the live sites.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        FixtureHandler.pages = {}
+        for name in os.listdir(FIXTURES_DIR):
+            if name.endswith(".html"):
+                with open(os.path.join(FIXTURES_DIR, name), "rb") as file:
+                    FixtureHandler.pages[name] = file.read()
+        self.server = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
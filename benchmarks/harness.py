@@ -0,0 +1,96 @@
+import math
+from collections import Counter
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from linkedin_scraper.metrics import metrics
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def webdriver_commands() -> Counter:
+    """The WebDriver commands counted by the metrics registry (see create_driver) since it was last reset."""
+    series = metrics.counters.get("webdriver_commands", {})
+    return Counter({dict(labels)["command"]: int(amount) for labels, amount in series.items()})
+
+
+class Benchmark:
+    """
+    Times one unit of work (a page, a batch) per call to measure() and summarizes the run. With
+    count_commands, the metrics registry is reset so the summary reports this benchmark's WebDriver commands.
+    """
+
+    def __init__(self, name: str, count_commands: bool = False):
+        self.name = name
+        self.count_commands = count_commands
+        if count_commands:
+            metrics.reset()
+        self.latencies = []
+        self.items = 0
+        self.errors = 0
+
+    def measure(self, work: Callable[[], int]):
+        """Runs work, which returns how many items it produced; a raised exception or 0 items counts as an error."""
+        start = perf_counter()
+        try:
+            items = work()
+        except Exception:
+            items = 0
+        self.latencies.append(perf_counter() - start)
+        self.items += items
+        if not items:
+            self.errors += 1
+
+    def summary(self) -> Dict:
+        seconds = sum(self.latencies)
+        pages = len(self.latencies)
+        result = {
+            "name": self.name,
+            "pages": pages,
+            "items": self.items,
+            "errors": self.errors,
+            "seconds": round(seconds, 4),
+            "pages_per_sec": round(pages / seconds, 3) if seconds else 0.0,
+            "items_per_sec": round(self.items / seconds, 3) if seconds else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(self.latencies, 50) * 1000, 2),
+                "p90": round(percentile(self.latencies, 90) * 1000, 2),
+                "p99": round(percentile(self.latencies, 99) * 1000, 2),
+                "max": round(max(self.latencies, default=0) * 1000, 2),
+            },
+        }
+        if self.count_commands:
+            commands = webdriver_commands()
+            total = sum(commands.values())
+            result["webdriver_commands"] = total
+            result["commands_per_page"] = round(total / pages, 2) if pages else 0.0
+            result["commands"] = dict(commands.most_common())
+        return result
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Returns a message for every benchmark whose throughput dropped, or command count rose, beyond tolerance."""
+    previous = {result["name"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before:
+            continue
+        if before["pages_per_sec"] and result["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: {result['pages_per_sec']} pages/sec, was {before['pages_per_sec']}"
+            )
+        if before.get("commands_per_page") and \
+                result.get("commands_per_page", 0) > before["commands_per_page"] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: {result['commands_per_page']} WebDriver commands/page, "
+                f"was {before['commands_per_page']}"
+            )
+    return regressions
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+from typing import Dict, List
+
+from benchmarks.harness import Benchmark
+
+FILLER_SENTENCES = [
+    "You will work closely with product managers and designers to deliver features for our customers.",
+    "We offer flexible hours, a hybrid work model and a generous learning budget.",
+    "The ideal candidate is a strong communicator who enjoys solving problems in a collaborative team.",
+    "This role reports to the engineering manager and is based in our Toronto office.",
+    "You will participate in code reviews, design discussions and on-call rotations.",
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Experience working in a fast-paced environment is considered an asset.",
+    "You will help improve the reliability, performance and scalability of our platform.",
+]
+
+
+def synthetic_corpus(size: int, seed: int = 13) -> List[str]:
+    """Job descriptions mixing skill taxonomy terms into boilerplate, so the gazetteer and TF-IDF paths both run."""
+    from linkedin_scraper.service.skill_matcher import load_taxonomy
+
+    rng = random.Random(seed)
+    terms = [term for label_terms in load_taxonomy().values() for term in label_terms]
+    corpus = []
+    for _ in range(size):
+        sentences = rng.sample(FILLER_SENTENCES, 4)
+        skills = rng.sample(terms, rng.randint(2, 12))
+        sentences.insert(1, f"Requirements include experience with {', '.join(skills)}.")
+        corpus.append(" ".join(sentences))
+    return corpus
+
+
+class InMemoryCollection:
+    """The slice of a pymongo collection JobProcessor uses, over a list of documents, so it runs without MongoDB."""
+
+    def __init__(self, documents: List[dict]):
+        self.documents = documents
+        self.updates = []
+
+    def find(self, query=None, projection=None, batch_size=None):
+        for document in self.documents:
+            if all(self._matches(document.get(field), condition) for field, condition in (query or {}).items()):
+                yield {field: value for field, value in document.items()
+                       if projection is None or projection.get(field, field == "_id")}
+
+    @staticmethod
+    def _matches(value, condition) -> bool:
+        if isinstance(condition, dict):
+            if "$in" in condition:
+                return value in condition["$in"]
+            if "$nin" in condition:
+                return value not in condition["$nin"]
+        return value == condition
+
+    def bulk_write(self, requests, ordered=True):
+        self.updates.extend(requests)
+
+
+def bench_job_processor(corpus_size: int, batch_size: int = 64) -> Dict:
+    """
+    JobProcessor.process_job_documents (language detection through the translation cache, nlp.pipe, keyword
+    selection and the bulk_write) on a synthetic corpus, with an in-memory jobs collection in place of MongoDB.
+    """
+    from bson import ObjectId
+    from linkedin_scraper.service.job_processor import JobProcessor
+
+    jobs = [{"_id": ObjectId(), "job_description": text} for text in synthetic_corpus(corpus_size)]
+    with tempfile.TemporaryDirectory() as workdir:
+        config = {
+            "logging": {"enabled": True, "level": "WARNING"},
+            "job_processor": {
+                "batch_size": batch_size,
+                "translator": "NONE",
+                "translation_cache_path": os.path.join(workdir, "translation_cache.db"),
+                "keyword_model_path": os.path.join(workdir, "keyword_model.joblib"),
+                "skill_pipeline_cache_dir": os.path.join(workdir, "skill_pipeline"),
+            },
+        }
+        jobs_collection = InMemoryCollection(jobs)
+        processor = JobProcessor(config=config, db={"jobs": jobs_collection})
+        # Fitted up front, as a real run loads the saved model, so the first batch doesn't time the fit
+        processor.fit_keyword_model()
+
+        def process_batch(batch):
+            written = len(jobs_collection.updates)
+            processor.process_job_documents(batch)
+            return len(jobs_collection.updates) - written
+
+        benchmark = Benchmark("job_processor")
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
+            benchmark.measure(lambda: process_batch(batch))
+        processor.translation_cache.close()
+
+    result = benchmark.summary()
+    result["batch_size"] = batch_size
+    return result
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from typing import Dict
+
+from benchmarks.harness import Benchmark
+
+# Job ids of the cards on the recorded search page; even ids use the jobs-description layout, odd ones the
+# feed-shared-inline-show-more-text layout
+FIXTURE_JOB_IDS = range(4012345600, 4012345625)
+SEARCH_TERM = "software engineer"
+
+
+@contextmanager
+def subjects_url(url: str):
+    from linkedin_scraper.scraper.subject_scraper import SubjectScraper
+    live_url, SubjectScraper.URL = SubjectScraper.URL, url
+    try:
+        yield
+    finally:
+        SubjectScraper.URL = live_url
+
+
+def course_list_url(base_url: str) -> str:
+    return f"{base_url}/Courses.cfm?Subject=COMPSCI&SelectedCalendar=Live&ArchiveID="
+
+
+def bench_job_urls(driver, base_url: str, iterations: int) -> Dict:
+    """JobUrlScraper: one search results page per iteration, scrolled until loaded and read."""
+    from linkedin_scraper.scraper.job_url_scraper import JobUrlScraper
+
+    benchmark = Benchmark("job_urls", count_commands=True)
+    scraper = JobUrlScraper(driver=driver, base_url=f"{base_url}/jobs/", scrape=False)
+    for _ in range(iterations):
+        benchmark.measure(lambda: len(scraper.search_jobs_page_for_linkedin_urls(SEARCH_TERM)))
+    return benchmark.summary()
+
+
+def bench_job_details(driver, base_url: str, iterations: int) -> Dict:
+    """JobScraper: one job detail page per iteration, alternating between both description layouts."""
+    from linkedin_scraper.scraper.job_scraper import JobScraper
+
+    def scrape(url):
+        job = JobScraper(url, driver=driver, scrape=True, close_on_complete=False)
+        return 1 if job.job_title and job.job_description else 0
+
+    benchmark = Benchmark("job_details", count_commands=True)
+    for i in range(iterations):
+        url = f"{base_url}/jobs/view/{FIXTURE_JOB_IDS[i % len(FIXTURE_JOB_IDS)]}/"
+        benchmark.measure(lambda: scrape(url))
+    return benchmark.summary()
+
+
+def bench_subjects(driver, base_url: str, iterations: int) -> Dict:
+    """SubjectScraper: the Courses.cfm subject table per iteration."""
+    from linkedin_scraper.scraper.subject_scraper import SubjectScraper
+
+    benchmark = Benchmark("subjects", count_commands=True)
+    with subjects_url(f"{base_url}/Courses.cfm?SelectedCalendar=Live"):
+        for _ in range(iterations):
+            benchmark.measure(lambda: len(SubjectScraper.scrape_all_subjects(driver)))
+    return benchmark.summary()
+
+
+def bench_courses(driver, base_url: str, iterations: int) -> Dict:
+    """CourseScraper: one subject course list per iteration."""
+    from linkedin_scraper.scraper.course_scraper import CourseScraper
+
+    benchmark = Benchmark("courses", count_commands=True)
+    url = course_list_url(base_url)
+    for _ in range(iterations):
+        benchmark.measure(lambda: len(CourseScraper.scrape_all_courses(driver, url, None)))
+    return benchmark.summary()
+
+
+def bench_subjects_http(session, base_url: str, iterations: int) -> Dict:
+    """SubjectScraper with the browserless engine."""
+    from linkedin_scraper.scraper.subject_scraper import SubjectScraper
+
+    benchmark = Benchmark("subjects_http")
+    with subjects_url(f"{base_url}/Courses.cfm?SelectedCalendar=Live"):
+        for _ in range(iterations):
+            benchmark.measure(lambda: len(SubjectScraper.scrape_all_subjects_http(session)))
+    return benchmark.summary()
+
+
+def bench_courses_http(session, base_url: str, iterations: int) -> Dict:
+    """CourseScraper with the browserless engine."""
+    from linkedin_scraper.scraper.course_scraper import CourseScraper
+
+    benchmark = Benchmark("courses_http")
+    url = course_list_url(base_url)
+    for _ in range(iterations):
+        benchmark.measure(lambda: len(CourseScraper.scrape_all_courses_http(session, url, None)))
+    return benchmark.summary()
+
+
+BROWSER_BENCHMARKS = {
+    "job_urls": bench_job_urls,
+    "job_details": bench_job_details,
+    "subjects": bench_subjects,
+    "courses": bench_courses,
+}
+HTTP_BENCHMARKS = {
+    "subjects_http": bench_subjects_http,
+    "courses_http": bench_courses_http,
+}
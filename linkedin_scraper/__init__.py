@@ -1,9 +1,19 @@
-from os.path import dirname, basename, isfile
-from linkedin_scraper.scraper.job_scraper import JobScraper
-from linkedin_scraper.scraper.job_url_scraper import JobUrlScraper
-
 __version__ = "2.11.4"
 
-import glob
-modules = glob.glob(dirname(__file__)+"/*.py")
-__all__ = [ basename(f)[:-3] for f in modules if isfile(f) and not f.endswith('__init__.py')]
+__all__ = ["JobScraper", "JobUrlScraper"]
+
+# The scrapers pull in Selenium, so they are only imported when first accessed (PEP 562). Importing the
+# documents, writers or processors doesn't need a browser stack.
+_LAZY_IMPORTS = {
+    "JobScraper": "linkedin_scraper.scraper.job_scraper",
+    "JobUrlScraper": "linkedin_scraper.scraper.job_url_scraper",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,19 @@
-import yaml
+import argparse
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-from datetime import datetime
-import os
-
-from linkedin_scraper.document.course_document import CourseDocument
-from linkedin_scraper.scraper.course_scraper import CourseScraper
-from mongo_client import get_database
-from linkedin_scraper.scraper.job_scraper import JobScraper
-from linkedin_scraper.scraper.job_url_scraper import JobUrlScraper
-from linkedin_scraper.scraper.subject_scraper import SubjectScraper
+import queue
+import threading
+
+from linkedin_scraper.mongo_client import get_database, load_config
+from linkedin_scraper.frontier import DoneOnFlush, Frontier
+from linkedin_scraper.metrics import count, metrics
+from linkedin_scraper.csv_sink import CsvSink, SUBJECT_HEADERS, COURSE_HEADERS
+
+# The Selenium, requests and pymongo based modules are imported inside the run functions, so starting a run
+# only loads the stack that run uses
+
+LINKEDIN_LOGIN_URL = "https://www.linkedin.com/login"
+LINKEDIN_FEED_URL = "https://www.linkedin.com/feed/"
+DEFAULT_PROFILE_DIR = "chrome_profile"
 
 def configure_logging(config):
     if config.get("logging", {}).get("enabled", False):
@@ -21,178 +22,383 @@ def configure_logging(config):
     else:
         logging.disable(logging.CRITICAL)
 
-def setup_csv(filename, headers):
-    if os.path.isfile(filename):
-        os.remove(filename)
-        logging.info(f"Deleted existing file: {filename}")
-    pd.DataFrame(columns=headers).to_csv(filename, encoding="utf-8", index=False)
-
 def run_job_scraper(config):
+    from linkedin_scraper.job_runner import JobRunner
+    from linkedin_scraper.scraper.driver_factory import create_driver
+
     logging.info("Starting Job Scraper")
 
-    # MongoDB setup
-    job_ids = []
-    if config["save_data_to"] == "MONGO":
-        db = get_database()
-        jobs_collection = db["jobs"]
-
-    # CSV setup
-    csv_filename = "linkedin_jobs.csv"
-    headers = [
-        "linkedin_job_id",
-        "linkedin_url",
-        "job_title",
-        "company",
-        "company_linkedin_url",
-        "location",
-        "posted_date",
-        "job_description",
-        "search_query",
-    ]
-    setup_csv(csv_filename, headers)
-
-    # Initialize the driver
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.maximize_window()
-
-    # Login to LinkedIn
-    driver.get("https://www.linkedin.com/login")
+    # Initialize the driver and login to LinkedIn
+    driver = create_driver()
+    driver.get(LINKEDIN_LOGIN_URL)
     input("Please manually log in to LinkedIn and press Enter here to continue...")
 
     # Job search setup
     search_query = input("Enter your job search term: ")
     pages_to_scrape = int(input("Enter the number of pages to scrape (max 40): "))
 
-    job_search = JobUrlScraper(driver=driver, close_on_complete=False, scrape=False)
-    job_listings = job_search.search_jobs_pages_for_linkedin_urls(search_query, pages_to_scrape)
-
-    for idx, job_listing in enumerate(job_listings):
-        try:
-            logging.info(f"Processing job {idx+1}/{len(job_listings)}: {job_listing.linkedin_url}")
-            job = JobScraper(job_listing.linkedin_url, driver=driver, scrape=True, close_on_complete=False)
-            job_data = job.to_dict()
-            job_data["search_query"] = search_query
-            job_data["search_date"] = datetime.today().strftime("%Y-%m-%d")
-            logging.debug(job_data)
+    sessions = int(config.get("job_scraper", {}).get("sessions", 1))
+    try:
+        with JobRunner(config) as runner:
+            runner.scrape_query(driver, search_query, pages_to_scrape, sessions=sessions)
+    finally:
+        driver.quit()
+        metrics.export(config)
 
-            # Save each job to MongoDB or CSV
-            if config["save_data_to"] == "MONGO":
-                result = jobs_collection.insert_one(job_data)
-                job_ids.append(str(result.inserted_id))
-                logging.info(f"Saved job {idx+1} to MongoDB")
-            elif config["save_data_to"] == "CSV":
-                job_df = pd.DataFrame([job_data])
-                job_df.to_csv(csv_filename, encoding="utf-8", mode='a', header=False, index=False)
-                logging.info(f"Appended job {idx+1} to CSV")
-
-        except Exception as e:
-            logging.error(f"Error processing job {idx+1}: {e}")
-
-    driver.quit()
     logging.info("Job scraping complete!")
 
-    # if config["save_data_to"] == "MONGO" and job_ids:
-    #     tokenizer = JobProcessor()
-    #     tokenizer.process_jobs(job_ids)
+def login_to_profile(config):
+    """Opens the batch Chrome profile so the LinkedIn login can be made once and reused by unattended runs."""
+    from linkedin_scraper.scraper.driver_factory import create_driver
+
+    driver = create_driver(profile_dir=config.get("batch", {}).get("chrome_profile_dir", DEFAULT_PROFILE_DIR))
+    try:
+        driver.get(LINKEDIN_LOGIN_URL)
+        input("Please manually log in to LinkedIn and press Enter here to save the session...")
+    finally:
+        driver.quit()
+
+def batch_queries(config, queries=None, pages=None):
+    """Returns (search_query, pages) pairs from the command line, or from batch.queries in config.yaml."""
+    batch_config = config.get("batch", {})
+    default_pages = int(pages or batch_config.get("pages", 1))
+    if queries:
+        return [(query, default_pages) for query in queries]
+
+    scheduled = []
+    for entry in batch_config.get("queries", []):
+        if isinstance(entry, str):
+            scheduled.append((entry, default_pages))
+        else:
+            scheduled.append((entry["query"], int(pages or entry.get("pages", default_pages))))
+    return scheduled
+
+def run_job_batch(config, queries=None, pages=None):
+    """
+    Scrapes a list of search queries without prompting. The first browser session reuses the login saved in
+    batch.chrome_profile_dir; further sessions import its cookies, and each session takes the next query
+    from a shared queue until none are left.
+    """
+    from linkedin_scraper.job_runner import JobRunner
+    from linkedin_scraper.scraper.driver_factory import create_driver
+    from linkedin_scraper.scraper.driver_pool import export_cookies, import_cookies
+
+    scheduled = batch_queries(config, queries, pages)
+    if not scheduled:
+        raise RuntimeError("No search queries given; pass --queries or set batch.queries in config.yaml")
+    logging.info(f"Starting batch Job Scraper for {len(scheduled)} queries")
+
+    batch_config = config.get("batch", {})
+    headless = batch_config.get("headless", False)
+    sessions = max(1, min(int(batch_config.get("sessions", 1)), len(scheduled)))
+
+    driver = create_driver(profile_dir=batch_config.get("chrome_profile_dir", DEFAULT_PROFILE_DIR), headless=headless)
+    driver.get(LINKEDIN_FEED_URL)
+    if "login" in driver.current_url or "authwall" in driver.current_url:
+        driver.quit()
+        raise RuntimeError("The Chrome profile is not logged in to LinkedIn; run with --login first")
+
+    cookies = export_cookies(driver)
+    query_queue = queue.Queue()
+    for search_query, pages_to_scrape in scheduled:
+        query_queue.put((search_query, pages_to_scrape))
+
+    def work(session_driver, runner):
+        while True:
+            try:
+                search_query, pages_to_scrape = query_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                runner.scrape_query(session_driver, search_query, pages_to_scrape)
+            except Exception as e:
+                count("errors", stage="search_query", error=type(e).__name__)
+                logging.error(f"Error scraping query '{search_query}': {e}")
+
+    drivers = [driver]
+    try:
+        with JobRunner(config) as runner:
+            for _ in range(sessions - 1):
+                session_driver = create_driver(headless=headless)
+                drivers.append(session_driver)
+                import_cookies(session_driver, cookies)
+            threads = [threading.Thread(target=work, args=(session_driver, runner), name=f"job-query-{i}")
+                       for i, session_driver in enumerate(drivers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        for session_driver in drivers:
+            try:
+                session_driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting driver: {e}")
+        metrics.export(config)
+
+    logging.info("Batch job scraping complete!")
 
 def run_course_scraper(config):
+    from bson import ObjectId
+    from linkedin_scraper.bulk_writer import BulkWriter
+    from linkedin_scraper.document.subject_document import SubjectDocument
+    from linkedin_scraper.queries import ensure_indexes
+    from linkedin_scraper.scraper.course_crawler import crawl_courses, ThreadLocalDrivers
+    from linkedin_scraper.scraper.course_scraper import CourseScraper
+    from linkedin_scraper.scraper.subject_scraper import SubjectScraper
+
     logging.info("Starting Course Scraper")
 
+    # Resume the unfinished subjects of an interrupted run, if any
+    frontier = Frontier.from_config(config)
+    frontier_queue = "subjects"
+    resuming = frontier is not None and frontier.has_pending(frontier_queue)
+    # Subjects are only marked done once their courses have been flushed
+    flushed_subjects = DoneOnFlush(frontier) if frontier else None
+
     # MongoDB setup
+    subjects_writer = None
+    courses_writer = None
     if config["save_data_to"] == "MONGO":
         db = get_database()
-        subjects_collection = db["subjects"]
-        courses_collection = db["courses"]
-
-    # CSV setup for subjects
-    subjects_csv = "subjects.csv"
-    subjects_headers = [
-        "subject_code",
-        "breadth_category",
-        "course_list_url",
-    ]
-    setup_csv(subjects_csv, subjects_headers)
-
-    # CSV setup for courses
-    courses_csv = "courses.csv"
-    courses_headers = [
-        "subject_id",
-        "number",
-        "suffix",
-        "campus",
-        "description",
-        "course_outline_ids",
-    ]
-    setup_csv(courses_csv, courses_headers)
-
-    # Initialize the driver
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.maximize_window()
+        if config.get("mongo", {}).get("ensure_indexes", True):
+            ensure_indexes(db)
+        subjects_writer = BulkWriter.from_config(config, db["subjects"])
+        courses_writer = BulkWriter.from_config(
+            config, db["courses"],
+            on_flush=(lambda documents: flushed_subjects.flushed(courses_writer.errors)) if flushed_subjects else None,
+        )
+
+    # CSV setup for subjects and courses
+    subjects_csv = None
+    courses_csv = None
+    if config["save_data_to"] == "CSV":
+        subjects_csv = CsvSink("subjects.csv", SUBJECT_HEADERS, reset=not resuming)
+        courses_csv = CsvSink("courses.csv", COURSE_HEADERS, reset=not resuming,
+                              on_flush=flushed_subjects.flushed if flushed_subjects else None)
+
+    # Initialize the driver, or a pooled HTTP session for the browserless engine
+    engine = config.get("course_scraper", {}).get("engine", "SELENIUM").upper()
+    workers = int(config.get("course_scraper", {}).get("workers", 1))
+    driver = None
+    session = None
+    worker_drivers = None
+    http_cache = None
+    # (url, meta, course ids) of the course lists whose courses were saved, committed to the HTTP cache once
+    # the last flush shows every one of their courses was inserted
+    cached_pages = []
+    if engine == "HTTP":
+        from linkedin_scraper.scraper.http_cache import HttpCache
+        from linkedin_scraper.scraper.http_session import create_session
+        session = create_session(pool_size=max(workers, 10))
+        # Skipping unchanged pages relies on the courses saved for them by earlier runs, which CSV output resets
+        if config["save_data_to"] == "MONGO":
+            http_cache = HttpCache.from_config(config)
+    else:
+        from linkedin_scraper.scraper.driver_factory import create_driver
+        driver = create_driver()
 
     try:
-        # Step 1: Scrape all subjects
-        subject_scraper = SubjectScraper(driver=driver)
-        subjects = subject_scraper.scrape_all_subjects(driver=driver)
-        for idx, subject_data in enumerate(subjects):
-            try:
+        # Step 1: Scrape all subjects, or reload the ones left over from the interrupted run
+        if resuming:
+            subjects = [
+                SubjectDocument(
+                    id=ObjectId(subject["_id"]) if subject.get("_id") else None,
+                    subject_code=subject["subject_code"],
+                    subject_name=subject["subject_name"],
+                    course_list_url=subject["course_list_url"],
+                    breadth_categories=subject["breadth_categories"],
+                )
+                for subject in frontier.pending(frontier_queue)
+            ]
+            logging.info(f"Resuming {len(subjects)} unfinished subjects")
+        else:
+            subjects_changed = True
+            if http_cache:
+                subjects, subjects_changed = SubjectScraper.scrape_subjects_if_changed(session, http_cache)
+                if not subjects_changed:
+                    logging.info(f"Subject list unchanged, keeping the {len(subjects)} stored subjects")
+            elif session:
+                subjects = SubjectScraper.scrape_all_subjects_http(session)
+            else:
+                subjects = SubjectScraper.scrape_all_subjects(driver=driver)
+            for idx, subject_data in enumerate(subjects if subjects_changed else []):
+                try:
+                    if config["save_data_to"] == "MONGO":
+                        subject_data.id = subjects_writer.add(subject_data.to_mongo().to_dict())
+                        logging.info(f"Queued subject {idx+1}: {subject_data.subject_code}")
+                    elif config["save_data_to"] == "CSV":
+                        subjects_csv.write(subject_data.to_mongo().to_dict())
+                        logging.info(f"Appended subject {idx+1}: {subject_data.subject_code} to CSV")
+                    else:
+                        raise RuntimeError("Choose a valid save_data_to value")
+                except Exception as e:
+                    logging.error(f"Error saving subject {idx+1}: {e}")
+            if subjects_writer:
+                subjects_writer.flush()
+            if http_cache and not (subjects_writer and subjects_writer.errors):
+                http_cache.commit(SubjectScraper.URL, {"subject_ids": {
+                    subject_data.subject_code: str(subject_data.id) for subject_data in subjects
+                }})
+            if frontier:
+                frontier.reset(frontier_queue, (
+                    (subject_data.subject_code, subject_data.to_mongo().to_dict()) for subject_data in subjects
+                ))
+
+        # Step 2: Use course_list_url to scrape courses for each subject
+        def save_courses(subject_data, courses):
+            if courses is None:
+                # Course list unchanged since its courses were saved
+                count("course_lists_unchanged")
+                if frontier:
+                    frontier.mark_done(frontier_queue, subject_data.subject_code)
+                return
+            if http_cache:
+                # Forget the page first, so a crash before the new courses are written refetches it in full
+                http_cache.discard(subject_data.course_list_url)
+                db["courses"].delete_many({"subject_id": subject_data.id})
+            course_dicts = [course_document.to_mongo().to_dict() for course_document in courses]
+            course_ids = []
+            if config["save_data_to"] == "MONGO":
+                course_ids = [course_data_dict.setdefault("_id", ObjectId()) for course_data_dict in course_dicts]
+            # Registered before the courses reach the writer, whose add() may flush them right away
+            if flushed_subjects:
+                flushed_subjects.add(frontier_queue, subject_data.subject_code, course_ids)
+            if http_cache:
+                cached_pages.append((subject_data.course_list_url, {"subject_id": str(subject_data.id)}, course_ids))
+            for course_data_dict in course_dicts:
                 if config["save_data_to"] == "MONGO":
-                    result = subjects_collection.insert_one(subject_data.to_mongo().to_dict())
-                    subject_data.id =  result.inserted_id
-                    logging.info(f"Saved subject {idx+1}: {subject_data.subject_code}")
+                    courses_writer.add(course_data_dict)
                 elif config["save_data_to"] == "CSV":
-                    subject_df = pd.DataFrame([subject_data.to_mongo().to_dict()])
-                    subject_df.to_csv(subjects_csv, encoding="utf-8", mode="a", header=False, index=False)
-                    logging.info(f"Appended subject {idx+1}: {subject_data.subject_code} to CSV")
-                else:
-                    raise RuntimeError("Choose a valid save_data_to value")
-            except Exception as e:
-                logging.error(f"Error saving subject {idx+1}: {e}")
+                    courses_csv.write(course_data_dict)
+
+        def record_failure(subject_data, error):
+            count("errors", stage="course_list", error=type(error).__name__)
+            logging.error(f"Error scraping courses for subject {subject_data.subject_code}: {error}")
+            if flushed_subjects:
+                flushed_subjects.discard(frontier_queue, subject_data.subject_code)
+            if frontier:
+                frontier.mark_failed(frontier_queue, subject_data.subject_code, error)
+
+        if workers > 1:
+            # Concurrent crawl: scraping fans out over a thread pool, saving stays on this thread
+            max_per_host = int(config.get("course_scraper", {}).get("max_requests_per_host", workers))
+            if http_cache:
+                scrape_courses = lambda subject: CourseScraper.scrape_courses_if_changed(
+                    session, subject.course_list_url, subject.id, http_cache)
+            elif session:
+                scrape_courses = lambda subject: CourseScraper.scrape_all_courses_http(
+                    session, subject.course_list_url, subject.id)
+            else:
+                worker_drivers = ThreadLocalDrivers(create_driver)
+                scrape_courses = lambda subject: CourseScraper.scrape_all_courses(
+                    driver=worker_drivers.get(), url=subject.course_list_url, subject_id=subject.id)
 
-        # Step 2: Use course_list_url to scrape courses for each subject
-        for idx, subject_data in enumerate(subjects):
             try:
-                course_scraper = CourseScraper()
-                course_list_url = subject_data.course_list_url
-                subject_id = subject_data.id
-                courses = course_scraper.scrape_all_courses(driver=driver, url=course_list_url, subject_id=subject_id)
-                for course_document in courses:
-                    course_data_dict = course_document.to_mongo().to_dict()
-                    if config["save_data_to"] == "MONGO":
-                        courses_collection.insert_one(course_data_dict)
-                    elif config["save_data_to"] == "CSV":
-                        course_df = pd.DataFrame([course_data_dict])
-                        course_df.to_csv("courses.csv", mode="a", header=False, index=False)
-            except Exception as e:
-             logging.error(f"Error scraping courses for subject {subject_data.subject_code}: {e}")
+                for subject_data, courses, error in crawl_courses(subjects, scrape_courses, workers, max_per_host):
+                    if error:
+                        record_failure(subject_data, error)
+                        continue
+                    try:
+                        save_courses(subject_data, courses)
+                    except Exception as e:
+                        record_failure(subject_data, e)
+            finally:
+                if worker_drivers:
+                    worker_drivers.quit_all()
+        else:
+            for idx, subject_data in enumerate(subjects):
+                try:
+                    course_list_url = subject_data.course_list_url
+                    subject_id = subject_data.id
+                    if http_cache:
+                        courses = CourseScraper.scrape_courses_if_changed(session, course_list_url, subject_id,
+                                                                          http_cache)
+                    elif session:
+                        courses = CourseScraper.scrape_all_courses_http(session, course_list_url, subject_id)
+                    else:
+                        courses = CourseScraper.scrape_all_courses(driver=driver, url=course_list_url, subject_id=subject_id)
+                    save_courses(subject_data, courses)
+                except Exception as e:
+                    record_failure(subject_data, e)
 
     finally:
-        driver.quit()
+        for writer in (subjects_writer, courses_writer):
+            if writer:
+                writer.flush()
+        if flushed_subjects and courses_writer:
+            # Settles subjects registered after the last flush, e.g. ones without courses
+            flushed_subjects.flushed(courses_writer.errors)
+        if cached_pages:
+            # A page whose courses failed to insert stays uncached, so the next run fetches it in full again
+            failed_ids = {error["_id"] for error in courses_writer.errors}
+            for url, meta, course_ids in cached_pages:
+                if failed_ids.isdisjoint(course_ids):
+                    http_cache.commit(url, meta)
+                else:
+                    logging.warning(f"Not caching {url}: some of its courses failed to insert")
+        for sink in (subjects_csv, courses_csv):
+            if sink:
+                sink.close()
+        if driver:
+            driver.quit()
+        if session:
+            session.close()
+        if frontier:
+            frontier.close()
+        metrics.export(config)
         logging.info("Course scraping complete!")
 
+    # Only courses whose description changed since the last run are re-processed
+    if config["save_data_to"] == "MONGO" and config.get("course_processor", {}).get("run_after_scrape", False):
+        from linkedin_scraper.service.course_processor import CourseProcessor
+        CourseProcessor().process_courses()
+
 
-        # if config["save_data_to"] == "MONGO" and course_ids:
-        #     processor = CoursesProcessor()
-        #     processor.process_courses(course_ids)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn jobs or UWO courses")
+    parser.add_argument("--scraper", choices=["jobs", "courses"], help="run a scraper without the menu prompt")
+    parser.add_argument("--batch", action="store_true",
+                        help="scrape jobs for a list of queries with the saved Chrome profile, without prompts")
+    parser.add_argument("--queries", nargs="+", help="search queries for --batch (default: batch.queries)")
+    parser.add_argument("--pages", type=int, help="pages to scrape per query for --batch")
+    parser.add_argument("--login", action="store_true", help="log in to LinkedIn once in the batch Chrome profile")
+    parser.add_argument("--relevance-index", choices=["update", "rebuild"],
+                        help="add new jobs to the course-job relevance index, or rebuild it from scratch")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
+
     # Load configuration
-    with open("config.yaml") as file:
-        config = yaml.safe_load(file)
+    config = load_config()
 
     # Configure logging
     configure_logging(config)
 
-    # Prompt user to choose scraper
-    print("Select a scraper to run:")
-    print("1. Job Scraper")
-    print("2. Course Scraper")
-    choice = input("Enter your choice (1 or 2): ").strip()
-
-    if choice == "1":
+    if args.login:
+        login_to_profile(config)
+    elif args.relevance_index:
+        from linkedin_scraper.service.relevance_index import update_relevance_index
+        update_relevance_index(config, rebuild=args.relevance_index == "rebuild")
+    elif args.batch:
+        run_job_batch(config, queries=args.queries, pages=args.pages)
+    elif args.scraper == "jobs":
         run_job_scraper(config)
-    elif choice == "2":
+    elif args.scraper == "courses":
         run_course_scraper(config)
     else:
-        print("Invalid choice. Exiting.")
+        # Prompt user to choose scraper
+        print("Select a scraper to run:")
+        print("1. Job Scraper")
+        print("2. Course Scraper")
+        choice = input("Enter your choice (1 or 2): ").strip()
+
+        if choice == "1":
+            run_job_scraper(config)
+        elif choice == "2":
+            run_course_scraper(config)
+        else:
+            print("Invalid choice. Exiting.")
@@ -0,0 +1,91 @@
+import logging
+from time import monotonic
+from typing import Callable, List, Optional
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from linkedin_scraper.metrics import count, timer
+
+
+class BulkWriter:
+    """
+    Buffers documents for a collection and inserts them with unordered insert_many once the buffer
+    reaches batch_size or flush_interval seconds have passed. _ids are assigned client-side so callers
+    get them back from add() immediately, before the batch is written. on_flush, if given, is called with
+    the documents of each batch that were actually inserted. If insert_many fails outright (e.g. the
+    server is unreachable) every document of the batch is recorded in errors before the error is raised.
+    """
+
+    def __init__(self, collection: Collection, batch_size: int = 500, flush_interval: float = 5.0,
+                 on_flush: Optional[Callable[[List[dict]], None]] = None):
+        self.collection = collection
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.inserted_ids = []
+        self.errors = []
+        self.last_flush = monotonic()
+
+    @classmethod
+    def from_config(cls, config: dict, collection: Collection, **kwargs):
+        mongo_config = config.get("mongo", {})
+        return cls(
+            collection,
+            batch_size=int(mongo_config.get("bulk_batch_size", 500)),
+            flush_interval=float(mongo_config.get("bulk_flush_interval", 5.0)),
+            **kwargs,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def add(self, document: dict) -> ObjectId:
+        document.setdefault("_id", ObjectId())
+        self.buffer.append(document)
+        if len(self.buffer) >= self.batch_size or monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+        return document["_id"]
+
+    def flush(self) -> List[ObjectId]:
+        """Writes the buffered documents and returns the ids that were inserted."""
+        self.last_flush = monotonic()
+        if not self.buffer:
+            return []
+
+        batch, self.buffer = self.buffer, []
+        try:
+            with timer("mongo_insert"):
+                inserted_ids = self.collection.insert_many(batch, ordered=False).inserted_ids
+        except BulkWriteError as e:
+            failed_indexes = set()
+            for write_error in e.details.get("writeErrors", []):
+                failed_indexes.add(write_error["index"])
+                document_id = batch[write_error["index"]]["_id"]
+                self.errors.append({"_id": document_id, "error": write_error.get("errmsg")})
+                logging.error(
+                    f"Error inserting document {document_id} into {self.collection.name}: {write_error.get('errmsg')}"
+                )
+            inserted_ids = [document["_id"] for idx, document in enumerate(batch) if idx not in failed_indexes]
+        except PyMongoError as e:
+            self.errors.extend({"_id": document["_id"], "error": str(e)} for document in batch)
+            count("write_errors", len(batch), collection=self.collection.name)
+            logging.error(f"Error inserting {len(batch)} documents into {self.collection.name}: {e}")
+            if self.on_flush:
+                self.on_flush([])
+            raise
+
+        self.inserted_ids.extend(inserted_ids)
+        count("documents_written", len(inserted_ids), collection=self.collection.name)
+        if len(inserted_ids) < len(batch):
+            count("write_errors", len(batch) - len(inserted_ids), collection=self.collection.name)
+        logging.info(f"Inserted {len(inserted_ids)}/{len(batch)} documents into {self.collection.name}")
+        if self.on_flush:
+            inserted = set(inserted_ids)
+            self.on_flush([document for document in batch if document["_id"] in inserted])
+        return inserted_ids
@@ -0,0 +1,123 @@
+import csv
+import logging
+import os
+from typing import Callable, Optional
+
+from linkedin_scraper.metrics import count, timer
+
+JOB_HEADERS = [
+    "linkedin_job_id",
+    "linkedin_url",
+    "job_title",
+    "company",
+    "company_linkedin_url",
+    "location",
+    "posted_date",
+    "job_description",
+    "search_query",
+    "search_date",
+    "canonical_job_id",
+    "is_duplicate",
+]
+
+SUBJECT_HEADERS = [
+    "subject_code",
+    "subject_name",
+    "breadth_categories",
+    "course_list_url",
+]
+
+COURSE_HEADERS = [
+    "subject_id",
+    "number",
+    "suffix",
+    "campus",
+    "description",
+    "course_outline_ids",
+]
+
+
+def reset_csv(filename, headers):
+    """Deletes any existing file and writes a fresh header row, retrying while the file is locked (e.g. open in Excel)."""
+    while True:
+        try:
+            if os.path.isfile(filename):
+                os.remove(filename)
+                logging.info(f"Deleted existing file: {filename}")
+            with open(filename, "w", encoding="utf-8", newline="") as file:
+                csv.writer(file).writerow(headers)
+            return
+        except PermissionError:
+            input("Please close " + filename + " (probably in Excel) and press Enter to retry...")
+
+
+def migrate_csv(filename, headers):
+    """
+    Rewrites an existing file whose header differs from headers (e.g. one written before columns were added)
+    so rows appended later line up with it. Columns missing from the old file are left empty; a file with
+    columns headers doesn't have is refused rather than dropping them.
+    """
+    with open(filename, encoding="utf-8", newline="") as file:
+        existing_headers = next(csv.reader(file), None)
+    if existing_headers == list(headers):
+        return
+    if not existing_headers:
+        reset_csv(filename, headers)
+        return
+    unknown = [header for header in existing_headers if header not in headers]
+    if unknown:
+        raise ValueError(f"{filename} has columns {unknown} that are no longer written; "
+                         f"move it aside to start a new file")
+
+    temp_filename = f"{filename}.tmp"
+    with open(filename, encoding="utf-8", newline="") as source, \
+            open(temp_filename, "w", encoding="utf-8", newline="") as target:
+        writer = csv.DictWriter(target, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(csv.DictReader(source))
+    os.replace(temp_filename, filename)
+    logging.info(f"Rewrote {filename} with the columns {', '.join(headers)}")
+
+
+class CsvSink:
+    """
+    Keeps one buffered CSV file open and writes dict rows in a fixed column order. on_flush, if given, is
+    called after each flush, once the rows written so far have left the buffer.
+    """
+
+    def __init__(self, filename, headers, flush_every=50, reset=True, on_flush: Optional[Callable[[], None]] = None):
+        if reset or not os.path.isfile(filename):
+            reset_csv(filename, headers)
+        else:
+            migrate_csv(filename, headers)
+        self.filename = filename
+        self.on_flush = on_flush
+        self.flush_every = flush_every
+        self.rows_since_flush = 0
+        self.file = open(filename, "a", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=headers, extrasaction="ignore")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, row: dict):
+        self.writer.writerow(row)
+        self.rows_since_flush += 1
+        if self.rows_since_flush >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        with timer("csv_flush"):
+            self.file.flush()
+        count("documents_written", self.rows_since_flush, collection=self.filename)
+        self.rows_since_flush = 0
+        if self.on_flush:
+            self.on_flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -1,4 +1,4 @@
-from mongoengine import StringField, IntField, URLField, DateField
+from mongoengine import StringField, IntField, URLField, DateField, BooleanField, BinaryField
 from linkedin_scraper.document.base_document import BaseDocument
 
 
@@ -13,4 +13,7 @@ class JobDocument(BaseDocument):
     company_linkedin_url = URLField()
     location = StringField()
     posted_date = DateField()
-    job_description = StringField()
\ No newline at end of file
+    job_description = StringField()
+    minhash = BinaryField()
+    canonical_job_id = IntField()
+    is_duplicate = BooleanField(default=False)
\ No newline at end of file
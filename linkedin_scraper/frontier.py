@@ -0,0 +1,152 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+
+PENDING = "PENDING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+
+class Frontier:
+    """
+    Persists the items a crawl has collected (job URLs, subjects) and the status of each in a local SQLite
+    file, so an interrupted run can resume with only the items that were not finished. Items are grouped
+    into named queues, e.g. one per search query. A failed item is retried by later runs until it has
+    failed max_attempts times; after that it no longer holds the queue back from being collected afresh.
+    """
+
+    def __init__(self, path: str = "crawl_frontier.db", max_attempts: int = 3):
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS frontier (
+                queue TEXT NOT NULL,
+                key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (queue, key)
+            )
+            """
+        )
+        columns = {name for _, name, *_ in self.connection.execute("PRAGMA table_info(frontier)")}
+        if "attempts" not in columns:
+            # Frontier files from before failed items were capped
+            self.connection.execute("ALTER TABLE frontier ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self.connection.commit()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Returns a frontier if frontier.enabled is set in config.yaml, otherwise None."""
+        frontier_config = config.get("frontier", {})
+        if not frontier_config.get("enabled", False):
+            return None
+        return cls(frontier_config.get("path", "crawl_frontier.db"), int(frontier_config.get("max_attempts", 3)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def reset(self, queue: str, items: Iterable[Tuple[str, dict]]):
+        """Replaces a queue with freshly collected (key, payload) items, all pending."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.connection:
+            self.connection.execute("DELETE FROM frontier WHERE queue = ?", (queue,))
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO frontier (queue, key, position, payload, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((queue, key, position, json.dumps(payload, default=str), PENDING, now)
+                 for position, (key, payload) in enumerate(items)),
+            )
+
+    def extend(self, queue: str, items: Iterable[Tuple[str, dict]]):
+        """Appends (key, payload) items to a queue after the ones already in it, e.g. one results page at a time."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.connection:
+            (last_position,) = self.connection.execute(
+                "SELECT COALESCE(MAX(position), -1) FROM frontier WHERE queue = ?", (queue,)
+            ).fetchone()
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO frontier (queue, key, position, payload, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((queue, key, last_position + 1 + position, json.dumps(payload, default=str), PENDING, now)
+                 for position, (key, payload) in enumerate(items)),
+            )
+
+    def has_pending(self, queue: str) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM frontier WHERE queue = ? AND (status = ? OR (status = ? AND attempts < ?)) LIMIT 1",
+            (queue, PENDING, FAILED, self.max_attempts),
+        ).fetchone()
+        return row is not None
+
+    def pending(self, queue: str) -> List[dict]:
+        """Returns the payloads of the pending items and the failed ones still to retry, in collection order."""
+        rows = self.connection.execute(
+            "SELECT payload FROM frontier WHERE queue = ? AND (status = ? OR (status = ? AND attempts < ?)) "
+            "ORDER BY position",
+            (queue, PENDING, FAILED, self.max_attempts),
+        ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def mark(self, queue: str, key: str, status: str, error: str = None):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE frontier SET status = ?, error = ?, updated_at = ?, "
+                "attempts = attempts + (CASE WHEN ? = ? THEN 1 ELSE 0 END) WHERE queue = ? AND key = ?",
+                (status, error, datetime.now(timezone.utc).isoformat(), status, FAILED, queue, key),
+            )
+
+    def mark_done(self, queue: str, key: str):
+        self.mark(queue, key, DONE)
+
+    def mark_failed(self, queue: str, key: str, error):
+        self.mark(queue, key, FAILED, str(error))
+
+
+class DoneOnFlush:
+    """
+    Defers marking frontier items done until the rows saved for them have been flushed by their BulkWriter
+    or CsvSink, so a crash can't lose buffered rows whose items are already done. Call flushed() from the
+    writer's flush callback; an item with a document among the writer's insert errors is marked failed.
+    Items must be added before their documents are handed to the writer, whose add() may flush them at once.
+    """
+
+    def __init__(self, frontier: Frontier, lock=None):
+        self.frontier = frontier
+        self.lock = lock or threading.RLock()
+        self.items = []
+
+    def add(self, queue: str, key: str, document_ids: Iterable = ()):
+        """Records an item whose documents (by _id, for a BulkWriter) are about to be handed to the writer."""
+        with self.lock:
+            self.items.append((queue, key, list(document_ids)))
+
+    def discard(self, queue: str, key: str):
+        """Forgets an item that failed before all of its documents reached the writer."""
+        with self.lock:
+            self.items = [item for item in self.items if item[:2] != (queue, key)]
+
+    def flushed(self, write_errors: List[dict] = ()):
+        with self.lock:
+            failed = {write_error["_id"]: write_error.get("error") for write_error in write_errors}
+            items, self.items = self.items, []
+            for queue, key, document_ids in items:
+                errors = [failed[document_id] for document_id in document_ids if document_id in failed]
+                if errors:
+                    self.frontier.mark_failed(queue, key, errors[0])
+                else:
+                    self.frontier.mark_done(queue, key)
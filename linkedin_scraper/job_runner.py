@@ -0,0 +1,242 @@
+import logging
+import threading
+from datetime import datetime
+from functools import partial
+from typing import Iterator, List
+
+from bson import ObjectId
+
+from linkedin_scraper.bulk_writer import BulkWriter
+from linkedin_scraper.csv_sink import CsvSink, JOB_HEADERS
+from linkedin_scraper.frontier import DoneOnFlush, Frontier
+from linkedin_scraper.metrics import count
+from linkedin_scraper.mongo_client import get_database
+from linkedin_scraper.pipeline import JobPipeline
+from linkedin_scraper.queries import ensure_indexes
+from linkedin_scraper.scraper.driver_factory import create_driver
+from linkedin_scraper.scraper.driver_pool import DriverPool, export_cookies
+from linkedin_scraper.scraper.job_scraper import JobScraper
+from linkedin_scraper.scraper.job_url_scraper import JobListing, JobUrlScraper
+from linkedin_scraper.seen_jobs import SeenJobIndex
+
+JOBS_CSV_FILENAME = "linkedin_jobs.csv"
+
+
+def scrape_jobs_sequentially(driver, job_listings):
+    for job_listing in job_listings:
+        try:
+            job = JobScraper(job_listing.linkedin_url, driver=driver, scrape=True, close_on_complete=False)
+            yield job_listing, job.to_dict(), None
+        except Exception as e:
+            yield job_listing, None, e
+
+
+class JobRunner:
+    """
+    Owns the outputs of a job scraping run (Mongo writer or CSV, seen-job index, frontier, pipeline) so one
+    or many search queries, possibly on several browser sessions at once, can be scraped into them.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.job_scraper_config = config.get("job_scraper", {})
+        self.save_data_to = config["save_data_to"]
+        skip_seen_jobs = self.job_scraper_config.get("skip_seen_jobs", False)
+        refresh_after_days = self.job_scraper_config.get("refresh_after_days")
+
+        self.job_ids = []
+        self.jobs_writer = None
+        self.jobs_csv = None
+        self.seen_jobs = None
+        self.duplicates = None
+        self.frontier = Frontier.from_config(config)
+        # The writer, CSV and frontier are shared by every query session, so access to them is serialized.
+        # Reentrant because a flush triggered while saving a job marks the flushed jobs done under it too.
+        self.lock = threading.RLock()
+        # Jobs are only marked done in the frontier once the writer has flushed them
+        self.flushed_jobs = DoneOnFlush(self.frontier, self.lock) if self.frontier else None
+
+        if self.save_data_to == "MONGO":
+            db = get_database()
+            if config.get("mongo", {}).get("ensure_indexes", True):
+                ensure_indexes(db)
+            self.jobs_writer = BulkWriter.from_config(config, db["jobs"], on_flush=self.stored)
+            if skip_seen_jobs:
+                self.seen_jobs = SeenJobIndex.from_mongo(db["jobs"], refresh_after_days)
+            if config.get("dedup", {}).get("enabled", False):
+                from linkedin_scraper.near_duplicates import NearDuplicateIndex, index_options
+                self.duplicates = NearDuplicateIndex.from_mongo(db["jobs"], **index_options(config))
+        elif self.save_data_to == "CSV":
+            # Append to the previous runs' file when it doubles as the seen-job index or runs can be resumed
+            if skip_seen_jobs:
+                self.seen_jobs = SeenJobIndex.from_csv(JOBS_CSV_FILENAME, refresh_after_days)
+            if config.get("dedup", {}).get("enabled", False):
+                from linkedin_scraper.near_duplicates import NearDuplicateIndex, index_options
+                self.duplicates = NearDuplicateIndex.from_csv(JOBS_CSV_FILENAME, **index_options(config))
+            self.jobs_csv = CsvSink(JOBS_CSV_FILENAME, JOB_HEADERS,
+                                    reset=not (skip_seen_jobs or self.duplicates is not None or self.frontier),
+                                    on_flush=self.flushed_jobs.flushed if self.flushed_jobs else None)
+        else:
+            raise RuntimeError("Choose a valid save_data_to value")
+
+        self.pipeline = None
+        self.process_stored = None
+        pipeline_config = config.get("pipeline", {})
+        if pipeline_config.get("enabled", False):
+            # Saving and keyword extraction run on their own threads while the browser loads the next job
+            process_jobs = None
+            if self.jobs_writer and pipeline_config.get("process_jobs", False):
+                from linkedin_scraper.service.job_processor import JobProcessor
+                process_jobs = JobProcessor().process_job_documents
+            self.pipeline = JobPipeline(
+                self.save_scraped_job,
+                flush=self.jobs_writer.flush if self.jobs_writer else None,
+                process_jobs=process_jobs,
+                queue_size=pipeline_config.get("queue_size", 100),
+                process_batch_size=pipeline_config.get("process_batch_size", 50),
+            )
+            if process_jobs:
+                self.process_stored = self.pipeline.stored
+            self.pipeline.start()
+
+    def stored(self, documents):
+        """The jobs writer's on_flush: marks the flushed jobs done and hands them to keyword extraction."""
+        if self.flushed_jobs:
+            self.flushed_jobs.flushed(self.jobs_writer.errors)
+        if self.process_stored:
+            self.process_stored(documents)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.pipeline:
+            self.pipeline.close()
+        if self.jobs_writer:
+            self.jobs_writer.flush()
+            if self.flushed_jobs:
+                # Settles anything registered after the last flush, which an empty buffer doesn't report
+                self.flushed_jobs.flushed(self.jobs_writer.errors)
+        if self.jobs_csv:
+            self.jobs_csv.close()
+        if self.frontier:
+            self.frontier.close()
+
+    def resume_job_listings(self, search_query) -> List[JobListing]:
+        """Returns the unfinished listings of an interrupted run of the query, if any."""
+        if not self.frontier:
+            return []
+        with self.lock:
+            pending = self.frontier.pending(f"jobs:{search_query}")
+        if pending:
+            logging.info(f"Resuming {len(pending)} unfinished jobs for '{search_query}'")
+        return [JobListing.from_url(listing["linkedin_url"], listing.get("job_title"), listing.get("company"))
+                for listing in pending]
+
+    def stream_job_listings(self, driver, search_query, pages_to_scrape) -> Iterator[JobListing]:
+        """Yields the query's listings page by page, recording each page in the frontier as it is read."""
+        frontier_queue = f"jobs:{search_query}"
+        if self.frontier:
+            with self.lock:
+                self.frontier.reset(frontier_queue, [])
+
+        job_search = JobUrlScraper(driver=driver, close_on_complete=False, scrape=False, seen_jobs=self.seen_jobs)
+        for page in job_search.iter_jobs_pages_for_linkedin_urls(search_query, pages_to_scrape):
+            if self.frontier:
+                with self.lock:
+                    self.frontier.extend(frontier_queue, ((listing.linkedin_url, listing._asdict()) for listing in page))
+            yield from page
+
+    def scrape_query(self, driver, search_query, pages_to_scrape, sessions=1):
+        """
+        Scrapes one search query on driver, which is left open. With sessions > 1 the detail pages are spread
+        over a pool of extra sessions that reuse driver's login, and the pool is quit afterwards.
+        """
+        logging.info(f"Scraping up to {pages_to_scrape} pages for '{search_query}'")
+        job_listings = self.resume_job_listings(search_query)
+        total = len(job_listings) or None
+
+        pool = None
+        scraped_jobs = None
+        try:
+            if sessions > 1 and not job_listings:
+                # The search session keeps paginating while the other sessions scrape the pages read so far
+                pool = DriverPool(sessions - 1, create_driver, export_cookies(driver))
+                scraped_jobs = pool.scrape_jobs(self.stream_job_listings(driver, search_query, pages_to_scrape))
+            elif sessions > 1:
+                # Nothing to paginate, so the search session scrapes job pages alongside the others
+                pool = DriverPool(sessions, create_driver, export_cookies(driver), drivers=[driver])
+                scraped_jobs = pool.scrape_jobs(job_listings)
+            else:
+                # A single session can't paginate and open job pages at once, so collect every page first
+                if not job_listings:
+                    job_listings = list(self.stream_job_listings(driver, search_query, pages_to_scrape))
+                    total = len(job_listings)
+                scraped_jobs = scrape_jobs_sequentially(driver, job_listings)
+
+            save_job = partial(self.save, search_query, total)
+            for idx, scraped_job in enumerate(scraped_jobs):
+                save_job(idx, scraped_job)
+        finally:
+            if pool:
+                # Stops the feeder paginating on driver before the next query uses it; driver stays open
+                if scraped_jobs is not None:
+                    scraped_jobs.close()
+                pool.drivers = [pool_driver for pool_driver in pool.drivers if pool_driver is not driver]
+                pool.quit_all()
+
+        logging.info(f"Finished '{search_query}'")
+
+    def save(self, search_query, total, idx, scraped_job):
+        item = (search_query, total, idx, scraped_job)
+        if self.pipeline:
+            self.pipeline.submit(item)
+        else:
+            self.save_scraped_job(item)
+
+    def save_scraped_job(self, item):
+        with self.lock:
+            self._save_scraped_job(item)
+
+    def _save_scraped_job(self, item):
+        search_query, total, idx, (job_listing, job_data, error) = item
+        frontier_queue = f"jobs:{search_query}"
+        try:
+            progress = f"{idx+1}/{total}" if total else f"{idx+1}"
+            logging.info(f"Processing job {progress} for '{search_query}': {job_listing.linkedin_url}")
+            if error:
+                raise error
+            job_data["search_query"] = search_query
+            job_data["search_date"] = datetime.today().strftime("%Y-%m-%d")
+            if self.duplicates is not None:
+                self.duplicates.assign(job_data)
+                if job_data["is_duplicate"]:
+                    count("near_duplicates")
+            logging.debug(job_data)
+
+            # Save each job to MongoDB or CSV
+            # The job is registered for the frontier first, as adding it to the writer may flush it right away
+            document_ids = []
+            if self.save_data_to == "MONGO":
+                document_ids.append(job_data.setdefault("_id", ObjectId()))
+            if self.flushed_jobs:
+                self.flushed_jobs.add(frontier_queue, job_listing.linkedin_url, document_ids)
+            if self.save_data_to == "MONGO":
+                self.jobs_writer.add(job_data)
+                self.job_ids.append(str(document_ids[0]))
+                logging.info(f"Queued job {idx+1} for MongoDB")
+            elif self.save_data_to == "CSV":
+                self.jobs_csv.write(job_data)
+                logging.info(f"Appended job {idx+1} to CSV")
+            count("jobs_scraped")
+
+        except Exception as e:
+            count("errors", stage="save_job", error=type(e).__name__)
+            logging.error(f"Error processing job {idx+1}: {e}")
+            if self.flushed_jobs:
+                self.flushed_jobs.discard(frontier_queue, job_listing.linkedin_url)
+            if self.frontier:
+                self.frontier.mark_failed(frontier_queue, job_listing.linkedin_url, e)
@@ -0,0 +1,170 @@
+import json
+import logging
+import math
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Dict, Tuple
+
+# Upper bounds in seconds of the Prometheus histogram buckets, spanning a fast script call to a slow page load
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Durations kept per stage for the percentiles of the JSON summary
+RESERVOIR_SIZE = 10000
+
+
+class StageHistogram:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        for idx, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[idx] += 1
+                break
+
+    def percentile(self, percent: float) -> float:
+        ordered = sorted(self.recent)
+        if not ordered:
+            return 0.0
+        return ordered[max(1, math.ceil(percent / 100 * len(ordered))) - 1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 4),
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p90_ms": round(self.percentile(90) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class Metrics:
+    """
+    Process-wide registry of stage durations and counters (WebDriver commands, retries, errors) shared by
+    the scrapers, writers and processors. Stages are timed with the timer() context manager or the timed()
+    decorator; a stage that raises also counts an error for it. Safe to use from several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, StageHistogram] = defaultdict(StageHistogram)
+        self.counters: Dict[str, Dict[Tuple, float]] = defaultdict(lambda: defaultdict(float))
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    def count(self, name: str, amount: float = 1, **labels):
+        with self._lock:
+            self.counters[name][tuple(sorted(labels.items()))] += amount
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.count("errors", stage=stage, error=type(e).__name__)
+            raise
+        finally:
+            self.observe(stage, perf_counter() - start)
+
+    def timed(self, stage: str):
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument_driver(self, driver):
+        """Counts every WebDriver command the driver sends; driver and WebElement calls all go through execute."""
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.count("webdriver_commands", command=driver_command)
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        return driver
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+                "counters": {
+                    name: {",".join(f"{key}={value}" for key, value in labels) or "total": amount
+                           for labels, amount in sorted(series.items())}
+                    for name, series in sorted(self.counters.items())
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "scraper") -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of each scraping, writing and processing stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.stages.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for labels, amount in sorted(series.items()):
+                    label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                    lines.append(f"{prefix}_{name}_total{{{label_text}}} {amount:g}" if label_text
+                                 else f"{prefix}_{name}_total {amount:g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, config: dict):
+        """
+        Writes the JSON summary, and the Prometheus text if metrics.prometheus_path is set, at the end of a run
+        when metrics.enabled is set in config.yaml.
+        """
+        metrics_config = config.get("metrics", {})
+        if not metrics_config.get("enabled", False):
+            return
+        summary_path = metrics_config.get("summary_path", "metrics.json")
+        prometheus_path = metrics_config.get("prometheus_path")
+        try:
+            if summary_path:
+                with open(summary_path, "w") as file:
+                    json.dump(self.summary(), file, indent=2)
+                logging.info(f"Wrote run metrics to {summary_path}")
+            if prometheus_path:
+                with open(prometheus_path, "w") as file:
+                    file.write(self.to_prometheus())
+                logging.info(f"Wrote Prometheus metrics to {prometheus_path}")
+        except OSError as e:
+            logging.error(f"Error writing metrics: {e}")
+
+
+metrics = Metrics()
+timer = metrics.timer
+timed = metrics.timed
+count = metrics.count
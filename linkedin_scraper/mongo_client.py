@@ -1,12 +1,21 @@
+import atexit
+import threading
+from functools import lru_cache
+
 import yaml
-from pymongo import MongoClient
 
+_client = None
+_client_lock = threading.Lock()
 
-def get_connection_string():
-    with open("config.yaml") as file:
-        config = yaml.safe_load(file)
 
-    mongo_config = config["mongo"]
+@lru_cache(maxsize=None)
+def load_config(config_path="config.yaml"):
+    with open(config_path) as file:
+        return yaml.safe_load(file)
+
+
+def get_connection_string():
+    mongo_config = load_config()["mongo"]
     connection_string = (
         f"mongodb+srv://{mongo_config['username']}:{mongo_config['password']}"
         f"@{mongo_config['cluster_url']}/{mongo_config['database']}?retryWrites=true&w=majority"
@@ -15,13 +24,42 @@ def get_connection_string():
     return connection_string
 
 
+def get_client_options():
+    mongo_config = load_config()["mongo"]
+    options = {
+        "maxPoolSize": mongo_config.get("max_pool_size", 50),
+        "minPoolSize": mongo_config.get("min_pool_size", 0),
+        "connectTimeoutMS": mongo_config.get("connect_timeout_ms", 10000),
+        "serverSelectionTimeoutMS": mongo_config.get("server_selection_timeout_ms", 30000),
+        "socketTimeoutMS": mongo_config.get("socket_timeout_ms"),
+    }
+    # e.g. ["zstd", "snappy"]; the server picks the first one both sides support
+    compressors = mongo_config.get("compressors")
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
 def get_mongo_client():
-    connection_string = get_connection_string()
-    return MongoClient(connection_string)
+    """Returns the process-wide MongoClient, creating it on first use so all callers share one connection pool."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Imported here so modules that only need load_config don't pay for pymongo
+                from pymongo import MongoClient
+                _client = MongoClient(get_connection_string(), **get_client_options())
+    return _client
 
 
 def get_database():
-    client = get_mongo_client()
-    with open("config.yaml") as file:
-        config = yaml.safe_load(file)
-    return client[config["mongo"]["database"]]
+    return get_mongo_client()[load_config()["mongo"]["database"]]
+
+
+@atexit.register
+def close_mongo_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,160 @@
+import csv
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 5) -> set:
+    """Overlapping word size-grams of the lowercased text; short texts become a single shingle."""
+    words = WORD_PATTERN.findall((text or "").lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[idx:idx + size]) for idx in range(len(words) - size + 1)}
+
+
+def index_options(config: dict) -> dict:
+    """NearDuplicateIndex arguments from the dedup section of config.yaml."""
+    dedup_config = config.get("dedup", {})
+    return {
+        "threshold": float(dedup_config.get("threshold", 0.8)),
+        "num_perm": int(dedup_config.get("num_perm", 128)),
+        "bands": int(dedup_config.get("bands", 16)),
+        "shingle_size": int(dedup_config.get("shingle_size", 5)),
+    }
+
+
+class MinHasher:
+    """Computes num_perm MinHash values of a text's shingles with universal hashing, vectorized over shingles."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        text_shingles = shingles(text, self.shingle_size)
+        if not text_shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in text_shingles),
+                             dtype=np.uint64, count=len(text_shingles))
+        # (shingles x permutations); uint64 overflow wraps, which is fine for hashing
+        permuted = ((np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME) & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    Clusters near-duplicate job descriptions (reposts under new ids, the same role in several cities) with
+    MinHash signatures and banded locality-sensitive hashing. A new job is only compared against jobs that
+    share at least one band bucket with it, so an insert costs O(bands) lookups plus a few verifications
+    rather than a scan. Each job maps to the canonical (first seen) job of its cluster; candidates count as
+    duplicates when their estimated Jaccard similarity is at least threshold.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16, shingle_size: int = 5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.minhasher = MinHasher(num_perm, shingle_size)
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.signatures = {}
+        self.canonical = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def band_keys(self, signature: np.ndarray):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find_canonical(self, signature: np.ndarray, band_keys=None):
+        """Returns the canonical job of the most similar indexed job at or above threshold, or None."""
+        candidates = set()
+        for bucket, key in zip(self.buckets, band_keys or self.band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+
+        best_job_id, best_similarity = None, self.threshold
+        for job_id in candidates:
+            similarity = float(np.mean(self.signatures[job_id] == signature))
+            if similarity >= best_similarity:
+                best_job_id, best_similarity = job_id, similarity
+        return self.canonical[best_job_id] if best_job_id is not None else None
+
+    def add(self, job_id, signature: np.ndarray, canonical_job_id=None):
+        """Indexes a job and returns its canonical job id (its own id if it starts a new cluster)."""
+        with self._lock:
+            if job_id in self.canonical:
+                return self.canonical[job_id]
+            band_keys = self.band_keys(signature)
+            canonical_job_id = canonical_job_id or self.find_canonical(signature, band_keys) or job_id
+            for bucket, key in zip(self.buckets, band_keys):
+                bucket[key].append(job_id)
+            self.signatures[job_id] = signature
+            self.canonical[job_id] = canonical_job_id
+            return canonical_job_id
+
+    def assign(self, job_data: dict) -> dict:
+        """Sets minhash, canonical_job_id and is_duplicate on a scraped job before it is stored."""
+        job_id = job_data.get("linkedin_job_id")
+        signature = self.minhasher.signature(job_data.get("job_description"))
+        if not job_id or signature is None:
+            job_data["canonical_job_id"] = job_id
+            job_data["is_duplicate"] = False
+            return job_data
+
+        canonical_job_id = self.add(job_id, signature)
+        job_data["minhash"] = signature.tobytes()
+        job_data["canonical_job_id"] = canonical_job_id
+        job_data["is_duplicate"] = canonical_job_id != job_id
+        if job_data["is_duplicate"]:
+            logging.info(f"Job {job_id} is a near-duplicate of job {canonical_job_id}")
+        return job_data
+
+    @classmethod
+    def from_mongo(cls, jobs_collection, **kwargs):
+        """Rebuilds the index from the signatures stored with earlier runs' jobs."""
+        index = cls(**kwargs)
+        expected_bytes = index.bands * index.rows * 4
+        cursor = jobs_collection.find(
+            {"minhash": {"$exists": True}}, {"_id": 0, "linkedin_job_id": 1, "minhash": 1, "canonical_job_id": 1},
+            batch_size=10000,
+        ).sort("_id", 1)
+        for job in cursor:
+            # Signatures computed with a different num_perm can't be compared and are left out
+            if job.get("linkedin_job_id") and len(job["minhash"]) == expected_bytes:
+                index.add(job["linkedin_job_id"], np.frombuffer(job["minhash"], dtype=np.uint32),
+                          job.get("canonical_job_id"))
+        logging.info(f"Loaded {len(index)} job signatures from MongoDB")
+        return index
+
+    @classmethod
+    def from_csv(cls, filename: str, **kwargs):
+        """Rebuilds the index from the descriptions of earlier runs' jobs."""
+        index = cls(**kwargs)
+        if os.path.isfile(filename):
+            with open(filename, encoding="utf-8", newline="") as file:
+                for row in csv.DictReader(file):
+                    try:
+                        job_id = int(row["linkedin_job_id"])
+                        canonical_job_id = int(row["canonical_job_id"]) if row.get("canonical_job_id") else None
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    signature = index.minhasher.signature(row.get("job_description"))
+                    if job_id and signature is not None:
+                        index.add(job_id, signature, canonical_job_id)
+        logging.info(f"Loaded {len(index)} job signatures from {filename}")
+        return index
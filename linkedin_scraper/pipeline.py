@@ -0,0 +1,87 @@
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional
+
+_DONE = object()
+
+
+class JobPipeline:
+    """
+    Overlaps the stages of a job run: the browser stage (the caller) submits scraped jobs, a persistence
+    thread saves them and an NLP thread processes the documents once they are stored. Stages are connected
+    by bounded queues so a slow stage applies back pressure instead of buffering the whole run. A failing
+    item is logged and skipped without stopping its stage.
+    """
+
+    def __init__(self, save_job: Callable[[object], None], flush: Callable[[], None] = None,
+                 process_jobs: Optional[Callable[[List[dict]], None]] = None, queue_size: int = 100,
+                 process_batch_size: int = 50):
+        self.save_job = save_job
+        self.flush = flush
+        self.process_jobs = process_jobs
+        self.process_batch_size = process_batch_size
+        self.persist_queue = queue.Queue(maxsize=queue_size)
+        self.process_queue = queue.Queue(maxsize=queue_size)
+        self.threads = [threading.Thread(target=self.persist_stage, name="job-persist", daemon=True)]
+        if process_jobs:
+            self.threads.append(threading.Thread(target=self.process_stage, name="job-process", daemon=True))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, item):
+        self.persist_queue.put(item)
+
+    def stored(self, documents: List[dict]):
+        """Hands documents that are now in MongoDB to the NLP stage; used as the BulkWriter's on_flush."""
+        if self.process_jobs:
+            for document in documents:
+                self.process_queue.put(document)
+
+    def close(self):
+        """Waits for every submitted job to pass through all stages."""
+        self.persist_queue.put(_DONE)
+        for thread in self.threads:
+            thread.join()
+
+    def persist_stage(self):
+        while True:
+            item = self.persist_queue.get()
+            if item is _DONE:
+                break
+            try:
+                self.save_job(item)
+            except Exception as e:
+                logging.error(f"Error saving job in pipeline: {e}")
+
+        try:
+            if self.flush:
+                self.flush()
+        except Exception as e:
+            logging.error(f"Error flushing jobs in pipeline: {e}")
+        finally:
+            self.process_queue.put(_DONE)
+
+    def process_stage(self):
+        batch = []
+        while True:
+            document = self.process_queue.get()
+            if document is not _DONE:
+                batch.append(document)
+            if batch and (document is _DONE or len(batch) >= self.process_batch_size):
+                try:
+                    self.process_jobs(batch)
+                except Exception as e:
+                    logging.error(f"Error processing {len(batch)} jobs in pipeline: {e}")
+                batch = []
+            if document is _DONE:
+                break
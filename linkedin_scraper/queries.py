@@ -0,0 +1,135 @@
+import logging
+import threading
+from typing import Iterator, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.database import Database
+
+from linkedin_scraper.document.course_document import CourseDocument
+from linkedin_scraper.document.job_document import JobDocument
+from linkedin_scraper.document.subject_document import SubjectDocument
+
+SUBJECTS = SubjectDocument._meta["collection"]
+COURSES = CourseDocument._meta["collection"]
+JOBS = JobDocument._meta["collection"]
+
+# Indexes behind the lookups below. linkedin_job_id is not unique because jobs re-scraped after
+# job_scraper.refresh_after_days are inserted again.
+INDEXES = {
+    SUBJECTS: [
+        IndexModel([("subject_code", ASCENDING)], name="subject_code"),
+    ],
+    COURSES: [
+        IndexModel([("subject_id", ASCENDING), ("number", ASCENDING), ("suffix", ASCENDING)],
+                   name="subject_id_number_suffix"),
+        IndexModel([("last_modified_date", ASCENDING)], name="last_modified_date"),
+        # CourseProcessor's lookup of processed copies of re-crawled courses
+        IndexModel([("processed_hash", ASCENDING)], name="processed_hash"),
+    ],
+    JOBS: [
+        IndexModel([("linkedin_job_id", ASCENDING)], name="linkedin_job_id"),
+        IndexModel([("search_query", ASCENDING), ("search_date", DESCENDING)], name="search_query_search_date"),
+        IndexModel([("search_date", DESCENDING)], name="search_date"),
+    ],
+}
+
+SUBJECT_PROJECTION = {"subject_code": 1, "subject_name": 1, "breadth_categories": 1, "course_list_url": 1}
+COURSE_PROJECTION = {"subject_id": 1, "number": 1, "suffix": 1, "description": 1, "campus": 1}
+# Leaves out the description and minhash, the bulk of a job document
+JOB_PROJECTION = {
+    "linkedin_job_id": 1, "linkedin_url": 1, "job_title": 1, "company": 1, "location": 1, "posted_date": 1,
+    "search_query": 1, "search_date": 1, "canonical_job_id": 1, "is_duplicate": 1,
+}
+DEFAULT_BATCH_SIZE = 1000
+
+_ensured = set()
+_ensured_lock = threading.Lock()
+
+
+def ensure_indexes(db: Database):
+    """Creates any missing INDEXES on db's collections, once per process and database."""
+    with _ensured_lock:
+        if db.name in _ensured:
+            return
+        for collection, indexes in INDEXES.items():
+            created = db[collection].create_indexes(indexes)
+            logging.info(f"Ensured indexes {', '.join(created)} on {collection}")
+        _ensured.add(db.name)
+
+
+def get_subject(db: Database, subject_code: str, projection: dict = SUBJECT_PROJECTION) -> Optional[dict]:
+    """Returns the most recently stored subject with subject_code, or None."""
+    return db[SUBJECTS].find_one({"subject_code": subject_code}, projection, sort=[("_id", DESCENDING)])
+
+
+def iter_subjects(db: Database, projection: dict = SUBJECT_PROJECTION,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    return db[SUBJECTS].find({}, projection, batch_size=batch_size)
+
+
+def get_course(db: Database, subject_id, number: int, suffix=None,
+               projection: dict = COURSE_PROJECTION) -> Optional[dict]:
+    """Returns a subject's course by number and, if given, suffix (as stored by the course scraper), or None."""
+    query = {"subject_id": subject_id, "number": number}
+    if suffix is not None:
+        query["suffix"] = suffix
+    return db[COURSES].find_one(query, projection)
+
+
+def courses_for_subject(db: Database, subject_id, number_from: int = None, number_to: int = None,
+                        projection: dict = COURSE_PROJECTION, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    """Yields a subject's courses ordered by number, optionally within [number_from, number_to]."""
+    query = {"subject_id": subject_id}
+    number_range = {}
+    if number_from is not None:
+        number_range["$gte"] = number_from
+    if number_to is not None:
+        number_range["$lte"] = number_to
+    if number_range:
+        query["number"] = number_range
+    return db[COURSES].find(query, projection, batch_size=batch_size).sort([("number", ASCENDING)])
+
+
+def get_job(db: Database, linkedin_job_id: int, projection: dict = JOB_PROJECTION) -> Optional[dict]:
+    """Returns the most recently scraped copy of a job, or None."""
+    return db[JOBS].find_one({"linkedin_job_id": linkedin_job_id}, projection, sort=[("search_date", DESCENDING)])
+
+
+def jobs_for_query(db: Database, search_query: str, since: str = None, until: str = None,
+                   include_duplicates: bool = False, projection: dict = JOB_PROJECTION,
+                   batch_size: int = DEFAULT_BATCH_SIZE, limit: int = 0) -> Iterator[dict]:
+    """
+    Yields the jobs scraped for search_query, newest search_date first, optionally within [since, until]
+    (YYYY-MM-DD, as stored). Near-duplicates are left out unless include_duplicates is set.
+    """
+    query = {"search_query": search_query}
+    date_range = _date_range(since, until)
+    if date_range:
+        query["search_date"] = date_range
+    if not include_duplicates:
+        query["is_duplicate"] = {"$ne": True}
+    return (db[JOBS].find(query, projection, batch_size=batch_size, limit=limit)
+            .sort([("search_date", DESCENDING)]))
+
+
+def jobs_scraped_between(db: Database, since: str = None, until: str = None, include_duplicates: bool = False,
+                         projection: dict = JOB_PROJECTION, batch_size: int = DEFAULT_BATCH_SIZE,
+                         limit: int = 0) -> Iterator[dict]:
+    """Yields the jobs of every query scraped within [since, until] (YYYY-MM-DD), newest first."""
+    query = {}
+    date_range = _date_range(since, until)
+    if date_range:
+        query["search_date"] = date_range
+    if not include_duplicates:
+        query["is_duplicate"] = {"$ne": True}
+    return (db[JOBS].find(query, projection, batch_size=batch_size, limit=limit)
+            .sort([("search_date", DESCENDING)]))
+
+
+def _date_range(since: Optional[str], until: Optional[str]) -> dict:
+    date_range = {}
+    if since is not None:
+        date_range["$gte"] = since
+    if until is not None:
+        date_range["$lte"] = until
+    return date_range
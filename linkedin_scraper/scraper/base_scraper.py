@@ -1,17 +1,21 @@
 import logging
 from dataclasses import dataclass
-from time import sleep
-from selenium.common import NoAlertPresentException, TimeoutException
+from time import sleep, monotonic
+from selenium.common import TimeoutException
 from selenium.webdriver import Chrome
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from linkedin_scraper.metrics import count, timed, timer
+
 @dataclass
 class BaseScraper:
     driver: Chrome = None
     WAIT_FOR_ELEMENT_TIMEOUT = 1
+    PAGE_LOAD_TIMEOUT = 10
+    POLL_INTERVAL = 0.25
     TOP_CARD = "pv-top-card"
 
     @staticmethod
@@ -19,29 +23,41 @@ class BaseScraper:
         sleep(int(duration))
 
     def focus(self):
-        self.driver.execute_script('alert("Focus window")')
-        try:
-            WebDriverWait(self.driver, 10).until(EC.alert_is_present())
-            self.driver.switch_to.alert.accept()
-        except (NoAlertPresentException, TimeoutException):
-            logging.warning("No alert found to accept.")
+        self.driver.switch_to.window(self.driver.current_window_handle)
+        self.driver.execute_script("window.focus();")
+
+    def load_page(self, url):
+        with timer("page_load"):
+            self.driver.get(url)
 
     def mouse_click(self, elem):
         action = webdriver.ActionChains(self.driver)
         action.move_to_element(elem).perform()
 
-    def wait_for_element_to_load(self, by=By.CLASS_NAME, name="pv-top-card", base=None):
+    @timed("wait_for_element")
+    def wait_for_element_to_load(self, by=By.CLASS_NAME, name="pv-top-card", base=None, timeout=None):
         base = base or self.driver
-        return WebDriverWait(base, self.WAIT_FOR_ELEMENT_TIMEOUT).until(
+        return WebDriverWait(base, timeout or self.WAIT_FOR_ELEMENT_TIMEOUT).until(
             EC.presence_of_element_located((by, name))
         )
 
-    def wait_for_all_elements_to_load(self, by=By.CLASS_NAME, name="pv-top-card", base=None):
+    @timed("wait_for_element")
+    def wait_for_all_elements_to_load(self, by=By.CLASS_NAME, name="pv-top-card", base=None, timeout=None):
         base = base or self.driver
-        return WebDriverWait(base, self.WAIT_FOR_ELEMENT_TIMEOUT).until(
+        return WebDriverWait(base, timeout or self.WAIT_FOR_ELEMENT_TIMEOUT).until(
             EC.presence_of_all_elements_located((by, name))
         )
 
+    def wait_for_staleness(self, element, timeout=None):
+        """Waits for an element from the previous page to be detached, i.e. for a navigation or re-render to happen."""
+        try:
+            with timer("wait_for_staleness"):
+                WebDriverWait(self.driver, timeout or self.PAGE_LOAD_TIMEOUT).until(EC.staleness_of(element))
+            return True
+        except TimeoutException:
+            logging.warning("Timed out waiting for the page to change.")
+            return False
+
     def is_signed_in(self):
         try:
             WebDriverWait(self.driver, self.WAIT_FOR_ELEMENT_TIMEOUT).until(
@@ -66,3 +82,34 @@ class BaseScraper:
         self.driver.execute_script(
             f'elem = document.getElementsByClassName("{class_name}")[0]; elem.scrollTo(0, elem.scrollHeight*{str(page_percent)});'
         )
+
+    @timed("scroll_until_stable")
+    def scroll_class_name_element_until_stable(self, class_name: str, item_class_name: str, timeout=None,
+                                               stable_polls=2) -> int:
+        """
+        Scrolls a lazily rendered list one viewport at a time until it is at the bottom and the number of
+        items inside it has stopped changing for stable_polls polls. Returns the final item count.
+        """
+        script = """
+            const elem = document.getElementsByClassName(arguments[0])[0];
+            if (!elem) return [-1, false];
+            elem.scrollBy(0, elem.clientHeight);
+            const atBottom = elem.scrollTop + elem.clientHeight >= elem.scrollHeight - 1;
+            return [elem.getElementsByClassName(arguments[1]).length, atBottom];
+        """
+        deadline = monotonic() + (timeout or self.PAGE_LOAD_TIMEOUT)
+        last_count = -1
+        stable = 0
+        while monotonic() < deadline:
+            item_count, at_bottom = self.driver.execute_script(script, class_name, item_class_name)
+            if at_bottom and item_count > 0 and item_count == last_count:
+                stable += 1
+                if stable >= stable_polls:
+                    return item_count
+            else:
+                stable = 0
+            last_count = item_count
+            sleep(self.POLL_INTERVAL)
+        count("timeouts", stage="scroll_until_stable")
+        logging.warning(f"Timed out waiting for {class_name} to finish loading, found {last_count} items.")
+        return last_count
@@ -0,0 +1,91 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from linkedin_scraper.document.course_document import CourseDocument
+from linkedin_scraper.document.subject_document import SubjectDocument
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests to any single host across worker threads."""
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+
+class ThreadLocalDrivers:
+    """Lazily creates one WebDriver per worker thread, since a driver cannot be shared between threads."""
+
+    def __init__(self, driver_factory: Callable):
+        self.driver_factory = driver_factory
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self.driver_factory()
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def quit_all(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting driver: {e}")
+
+
+def crawl_courses(
+        subjects: List[SubjectDocument],
+        scrape_courses: Callable[[SubjectDocument], Optional[List[CourseDocument]]],
+        max_workers: int = 4,
+        max_per_host: int = 4,
+) -> Iterator[Tuple[SubjectDocument, Optional[List[CourseDocument]], Optional[Exception]]]:
+    """
+    Scrapes the courses of every subject on a bounded thread pool, yielding (subject, courses, error) in
+    completion order. A failing subject yields its exception and does not affect the others.
+    """
+    limiter = HostLimiter(max_per_host)
+
+    def scrape(subject):
+        with limiter.for_url(subject.course_list_url):
+            return scrape_courses(subject)
+
+    total = len(subjects)
+    completed = 0
+    failed = 0
+    course_count = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="course-crawler") as executor:
+        futures = {executor.submit(scrape, subject): subject for subject in subjects}
+        for future in as_completed(futures):
+            subject = futures[future]
+            completed += 1
+            try:
+                courses = future.result()
+            except Exception as e:
+                failed += 1
+                yield subject, [], e
+            else:
+                # None is an unchanged course list (scrape_courses_if_changed)
+                course_count += len(courses or [])
+                yield subject, courses, None
+            logging.info(
+                f"Course crawl progress: {completed}/{total} subjects, {course_count} courses, {failed} failed"
+            )
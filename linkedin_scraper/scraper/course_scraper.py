@@ -1,10 +1,14 @@
 import logging
-from typing import List
+from typing import List, Optional
+import requests
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from linkedin_scraper.document.course_document import CourseDocument
 from linkedin_scraper.document.enums.campus import Campus
+from linkedin_scraper.metrics import count, timer
+from linkedin_scraper.scraper.http_cache import HttpCache
+from linkedin_scraper.scraper.http_session import fetch_html, fetch_html_if_changed, element_text
 
 
 def parse_course_title(title: str):
@@ -20,49 +24,103 @@ def parse_course_title(title: str):
         return None, None
 
 
+def parse_campus(campus_image_alt: str):
+    if "Western Main Campus" in campus_image_alt:
+        return Campus.WESTERN.value
+    elif "King's" in campus_image_alt:
+        return Campus.KINGS.value
+    elif "Huron" in campus_image_alt:
+        return Campus.HURON.value
+    return None
+
+
+def build_course_document(subject_id, course_title: str, description: str, campus_image_alt: str) -> CourseDocument:
+    number, suffix = parse_course_title(course_title)
+    course_document = CourseDocument(
+        subject_id=subject_id,
+        number=number,
+        suffix=suffix,
+        description=description,
+        campus=parse_campus(campus_image_alt or ""),
+        course_outline_ids=[],
+    )
+    logging.info(f"Scraped course: {course_title}")
+    return course_document
+
+
 class CourseScraper:
+    COURSE_PANELS_XPATH = "//div[@class='col-md-12']"
+    COURSE_TITLE_XPATH = ".//h4[@class='courseTitleNoBlueLink']/a"
+    DESCRIPTION_XPATH = ".//div[@class='panel-body']/div/div"
+    CAMPUS_IMAGE_XPATH = ".//img[contains(@class, 'pull-right')]"
+
     @staticmethod
     def scrape_all_courses(driver: WebDriver, url: str, subject_id) -> List[CourseDocument]:
         courses = []
         try:
-            driver.get(url)
-            course_panels = driver.find_elements(By.XPATH, "//div[@class='col-md-12']")
+            with timer("page_load"):
+                driver.get(url)
+            course_panels = driver.find_elements(By.XPATH, CourseScraper.COURSE_PANELS_XPATH)
             course_panels.pop(0)
             for idx, panel in enumerate(course_panels):
                 try:
-                    course_title_element = panel.find_element(By.XPATH, ".//h4[@class='courseTitleNoBlueLink']/a")
-                    course_title = course_title_element.text.strip()
-                    number, suffix = parse_course_title(course_title)
+                    course_title = panel.find_element(By.XPATH, CourseScraper.COURSE_TITLE_XPATH).text.strip()
+                    description = panel.find_element(By.XPATH, CourseScraper.DESCRIPTION_XPATH).text.strip()
+                    campus_image_alt = panel.find_element(
+                        By.XPATH, CourseScraper.CAMPUS_IMAGE_XPATH).get_attribute("alt")
+                    courses.append(build_course_document(subject_id, course_title, description, campus_image_alt))
 
-                    description_element = panel.find_element(By.XPATH, ".//div[@class='panel-body']/div/div")
-                    description = description_element.text.strip()
+                except NoSuchElementException as e:
+                    count("errors", stage="course_panel", error=type(e).__name__)
+                    logging.error(f"Error processing course panel: {e}")
+        except Exception as e:
+            logging.error(f"Error scraping courses from {url}: {e}")
+        return courses
 
-                    campus_image_element = panel.find_element(By.XPATH, ".//img[contains(@class, 'pull-right')]")
-                    campus_image_alt = campus_image_element.get_attribute("alt")
+    @staticmethod
+    def scrape_all_courses_http(session: requests.Session, url: str, subject_id) -> List[CourseDocument]:
+        """Scrapes a subject's course list from the server-rendered page without a browser."""
+        try:
+            return CourseScraper.parse_courses(fetch_html(session, url), subject_id)
+        except Exception as e:
+            logging.error(f"Error scraping courses from {url}: {e}")
+            return []
 
-                    if "Western Main Campus" in campus_image_alt:
-                        campus = Campus.WESTERN.value
-                    elif "King's" in campus_image_alt:
-                        campus = Campus.KINGS.value
-                    elif "Huron" in campus_image_alt:
-                        campus = Campus.HURON.value
-                    else:
-                        campus = None
+    @staticmethod
+    def scrape_courses_if_changed(session: requests.Session, url: str, subject_id,
+                                  cache: HttpCache) -> Optional[List[CourseDocument]]:
+        """
+        Scrapes a subject's course list through cache, returning None without parsing it when the page is
+        unchanged since its courses were saved under the same subject_id. Fetch errors are raised rather than
+        returned as an empty list, so the subject's saved courses aren't replaced with nothing.
+        """
+        conditional = cache.entry(url).get("meta", {}).get("subject_id") == str(subject_id)
+        tree, changed = fetch_html_if_changed(session, url, cache, conditional=conditional)
+        if not changed:
+            logging.info(f"Course list unchanged: {url}")
+            return None
+        return CourseScraper.parse_courses(tree, subject_id)
 
-                    course_document = CourseDocument(
-                        subject_id=subject_id,
-                        number=number,
-                        suffix=suffix,
-                        description=description,
-                        campus=campus,
-                        course_outline_ids=[],
-                    )
-                    courses.append(course_document)
+    @staticmethod
+    def parse_courses(tree, subject_id) -> List[CourseDocument]:
+        courses = []
+        course_panels = tree.xpath(CourseScraper.COURSE_PANELS_XPATH)[1:]
+        for panel in course_panels:
+            try:
+                title_elements = panel.xpath(CourseScraper.COURSE_TITLE_XPATH)
+                description_elements = panel.xpath(CourseScraper.DESCRIPTION_XPATH)
+                campus_image_elements = panel.xpath(CourseScraper.CAMPUS_IMAGE_XPATH)
+                if not (title_elements and description_elements and campus_image_elements):
+                    raise NoSuchElementException("Course panel is missing a title, description or campus image")
 
-                    logging.info(f"Scraped course: {course_title}")
+                courses.append(build_course_document(
+                    subject_id,
+                    element_text(title_elements[0]),
+                    element_text(description_elements[0]),
+                    campus_image_elements[0].get("alt"),
+                ))
 
-                except NoSuchElementException as e:
-                    logging.error(f"Error processing course panel: {e}")
-        except Exception as e:
-            logging.error(f"Error scraping courses from {url}: {e}")
+            except NoSuchElementException as e:
+                count("errors", stage="course_panel", error=type(e).__name__)
+                logging.error(f"Error processing course panel: {e}")
         return courses
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from linkedin_scraper.metrics import metrics, timer
+
+DEFAULT_DRIVER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "linkedin_scraper", "chromedriver.json")
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def load_chrome_config() -> dict:
+    from linkedin_scraper.mongo_client import load_config
+    try:
+        return load_config().get("chrome", {}) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def detect_browser_version():
+    """Returns the installed Chrome's major version, read locally without the manager's network lookups."""
+    try:
+        from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+        version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        return version.split(".")[0] if version else None
+    except Exception as e:
+        logging.warning(f"Could not detect the Chrome version: {e}")
+        return None
+
+
+def read_driver_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_driver_cache(cache_path: str, entry: dict):
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w") as file:
+            json.dump(entry, file, indent=2)
+    except OSError as e:
+        logging.warning(f"Could not cache the chromedriver path in {cache_path}: {e}")
+
+
+def resolve_driver_path(chrome_config: dict = None) -> str:
+    """
+    Finds the chromedriver binary, in order: chrome.driver_path from config.yaml; the path cached by an
+    earlier run, if it was resolved for the same pinned chrome.driver_version (or, unpinned, the same
+    installed Chrome major version) and still exists; otherwise ChromeDriverManager, whose result is cached.
+    The path is resolved once per process.
+    """
+    global _driver_path
+    if _driver_path:
+        return _driver_path
+
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+        chrome_config = load_chrome_config() if chrome_config is None else chrome_config
+
+        with timer("driver_resolve"):
+            if chrome_config.get("driver_path"):
+                _driver_path = chrome_config["driver_path"]
+                return _driver_path
+
+            cache_path = chrome_config.get("driver_cache_path", DEFAULT_DRIVER_CACHE_PATH)
+            pinned_version = chrome_config.get("driver_version")
+            # A pinned driver version identifies the binary on its own, so the browser is only probed when unpinned
+            browser_version = None if pinned_version else detect_browser_version()
+            key = f"driver:{pinned_version}" if pinned_version else f"browser:{browser_version}"
+
+            cached = read_driver_cache(cache_path)
+            if cached.get("key") == key and cached.get("driver_path") and os.path.isfile(cached["driver_path"]):
+                logging.info(f"Using cached chromedriver {cached['driver_path']}")
+                _driver_path = cached["driver_path"]
+                return _driver_path
+
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager(driver_version=pinned_version).install()
+            # Without a known version there is nothing to validate a cached path against next time
+            if pinned_version or browser_version:
+                write_driver_cache(cache_path, {
+                    "key": key,
+                    "driver_path": _driver_path,
+                    "resolved_at": datetime.now(timezone.utc).isoformat(),
+                })
+            return _driver_path
+
+
+def create_driver(profile_dir=None, headless=False, maximize=True) -> webdriver.Chrome:
+    """
+    Starts Chrome. With profile_dir the browser keeps its cookies in that user data directory, so a LinkedIn
+    login made once in it is reused by later unattended runs.
+    """
+    options = webdriver.ChromeOptions()
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+
+    driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+    if maximize and not headless:
+        driver.maximize_window()
+    return metrics.instrument_driver(driver)
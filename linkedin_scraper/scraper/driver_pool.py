@@ -0,0 +1,152 @@
+import logging
+import queue
+import threading
+from typing import Callable, Iterator, List, Tuple
+
+from linkedin_scraper.metrics import count
+from linkedin_scraper.scraper.job_scraper import JobScraper
+
+LINKEDIN_URL = "https://www.linkedin.com"
+_DONE = object()
+
+
+def export_cookies(driver) -> List[dict]:
+    """Exports the session cookies of a logged in driver so other sessions can reuse the login."""
+    return driver.get_cookies()
+
+
+def import_cookies(driver, cookies: List[dict], url: str = LINKEDIN_URL):
+    # Cookies can only be added for the domain that is currently loaded
+    driver.get(url)
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logging.warning(f"Could not import cookie {cookie.get('name')}: {e}")
+    driver.refresh()
+
+
+def is_alive(driver) -> bool:
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """
+    Scrapes job detail pages on N browser sessions that share one authenticated login. Each session runs on
+    its own thread and pulls listings from a shared queue; a session whose browser dies is replaced and the
+    listing it was working on is retried once. Listings may be a generator that is still paginating: it is
+    drained on a feeder thread, so sessions start on the first page's jobs right away. Closing the results
+    generator early stops the feeder and the sessions and waits for them, so the paginating driver is free
+    for its caller again.
+    """
+
+    def __init__(self, size: int, driver_factory: Callable, cookies: List[dict], drivers: List = None):
+        self.size = size
+        self.driver_factory = driver_factory
+        self.cookies = cookies
+        self.drivers = list(drivers or [])[:size]
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit_all()
+
+    def new_driver(self):
+        driver = self.driver_factory()
+        import_cookies(driver, self.cookies)
+        return driver
+
+    def replace_driver(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        new_driver = self.new_driver()
+        with self._lock:
+            self.drivers[self.drivers.index(driver)] = new_driver
+        return new_driver
+
+    def quit_all(self):
+        with self._lock:
+            drivers, self.drivers = self.drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting driver: {e}")
+
+    def scrape_jobs(self, job_listings, max_retries: int = 1) -> Iterator[Tuple[object, dict, Exception]]:
+        """Yields (job_listing, job_data, error) for every listing in completion order."""
+        while len(self.drivers) < self.size:
+            self.drivers.append(self.new_driver())
+
+        listings = queue.Queue()
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def feed():
+            job_listings_iter = iter(job_listings)
+            try:
+                # Checked before each next(), so a paginating generator stops between pages
+                for job_listing in job_listings_iter:
+                    listings.put(job_listing)
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                logging.error(f"Error collecting job listings: {e}")
+            finally:
+                # Closed here, on the thread that runs it, rather than whenever it is garbage collected
+                if hasattr(job_listings_iter, "close"):
+                    job_listings_iter.close()
+                for _ in range(len(self.drivers)):
+                    listings.put(_DONE)
+
+        def work(driver):
+            while True:
+                job_listing = listings.get()
+                if job_listing is _DONE or stop.is_set():
+                    return
+                for attempt in range(max_retries + 1):
+                    try:
+                        job = JobScraper(job_listing.linkedin_url, driver=driver, scrape=True, close_on_complete=False)
+                        results.put((job_listing, job.to_dict(), None))
+                        break
+                    except Exception as e:
+                        if is_alive(driver):
+                            results.put((job_listing, None, e))
+                            break
+                        logging.warning(f"Browser session crashed on {job_listing.linkedin_url}, restarting it")
+                        count("retries", stage="job_details")
+                        try:
+                            driver = self.replace_driver(driver)
+                        except Exception as restart_error:
+                            results.put((job_listing, None, restart_error))
+                            return
+                        if attempt == max_retries:
+                            results.put((job_listing, None, e))
+
+        workers = [threading.Thread(target=work, args=(driver,), name=f"job-session-{i}", daemon=True)
+                   for i, driver in enumerate(self.drivers)]
+        feeder = threading.Thread(target=feed, name="job-listings", daemon=True)
+        feeder.start()
+        for worker in workers:
+            worker.start()
+
+        try:
+            while True:
+                try:
+                    yield results.get(timeout=1)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers) and results.empty():
+                        break
+        finally:
+            stop.set()
+            feeder.join()
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class HttpCache:
+    """
+    On-disk cache of calendar pages for conditional fetches. Each URL keeps its ETag, Last-Modified, the
+    SHA-256 of its body, the body itself and caller metadata (e.g. the subject id its courses were saved
+    under). Fetches stage the new validators; they are only written by commit() once the caller has saved
+    the page's data, so a page whose data was lost in a crash is fetched in full again.
+    """
+
+    def __init__(self, directory: str = ".http_cache"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._staged = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Returns a cache if course_scraper.http_cache.enabled is set in config.yaml, otherwise None."""
+        cache_config = config.get("course_scraper", {}).get("http_cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        return cls(cache_config.get("path", ".http_cache"))
+
+    def _path(self, url: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.{extension}")
+
+    def entry(self, url: str) -> dict:
+        """Returns the committed entry of a URL, or {} if there is none or its body is missing."""
+        try:
+            with open(self._path(url, "json")) as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entry if os.path.isfile(self._path(url, "html")) else {}
+
+    def body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._path(url, "html"), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def stage(self, url: str, entry: dict, response=None) -> bool:
+        """
+        Stages the validators of a fetch against the committed entry and returns whether the page changed:
+        a 304 (response is None) is unchanged, and so is a 200 whose body hashes the same as the cached one.
+        """
+        if response is None:
+            with self._lock:
+                self._staged[url] = (dict(entry), None)
+            return False
+
+        digest = content_hash(response.content)
+        staged = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": digest,
+            "meta": entry.get("meta", {}),
+        }
+        with self._lock:
+            self._staged[url] = (staged, response.content)
+        return digest != entry.get("content_hash")
+
+    def commit(self, url: str, meta: dict = None):
+        """Writes the staged entry of a URL (with meta, if given) once its data has been saved."""
+        with self._lock:
+            staged = self._staged.pop(url, None)
+        if staged is None:
+            return
+        entry, content = staged
+        if meta is not None:
+            entry["meta"] = meta
+        entry["fetched_at"] = datetime.now(timezone.utc).isoformat()
+        try:
+            if content is not None:
+                with open(self._path(url, "html"), "wb") as file:
+                    file.write(content)
+            with open(self._path(url, "json"), "w") as file:
+                json.dump(entry, file, indent=2)
+        except OSError as e:
+            logging.warning(f"Could not cache {url} in {self.directory}: {e}")
+
+    def discard(self, url: str):
+        """Forgets a URL, e.g. before its previously saved data is replaced."""
+        try:
+            os.remove(self._path(url, "json"))
+        except OSError:
+            pass
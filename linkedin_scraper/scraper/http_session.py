@@ -0,0 +1,85 @@
+from typing import Optional, Tuple
+
+import requests
+from lxml import html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from linkedin_scraper.metrics import count, timer
+from linkedin_scraper.scraper.http_cache import HttpCache
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/130.0.0.0 Safari/537.36"
+)
+REQUEST_TIMEOUT = 30
+
+
+def create_session(pool_size=10, retries=3) -> requests.Session:
+    """Creates a requests session with a pooled, retrying adapter for the calendar site."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def count_retries(response):
+    # Retries urllib3 made for this response, e.g. after a 503
+    if response.raw is not None and response.raw.retries is not None and response.raw.retries.history:
+        count("retries", len(response.raw.retries.history), stage="page_load")
+
+
+def parse_html(content: bytes, base_url: str):
+    tree = html.fromstring(content)
+    tree.make_links_absolute(base_url)
+    return tree
+
+
+def fetch_html(session: requests.Session, url: str):
+    """Fetches a page and parses it into an lxml tree with absolute links."""
+    with timer("page_load"):
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    count_retries(response)
+    return parse_html(response.content, response.url)
+
+
+def fetch_html_if_changed(session: requests.Session, url: str, cache: HttpCache, conditional=True,
+                          parse_unchanged=False) -> Tuple[Optional[object], bool]:
+    """
+    Fetches a page with a conditional GET against its cached validators and returns (tree, changed). An
+    unchanged page (a 304, or a 200 with the cached body's hash) is only parsed, from the cached body, with
+    parse_unchanged; otherwise tree is None. Without conditional the page is fetched in full and counts as
+    changed. The new validators are staged in cache for the caller to commit once the page's data is saved.
+    """
+    entry = cache.entry(url) if conditional else {}
+    with timer("page_load"):
+        response = session.get(url, headers=cache.conditional_headers(entry), timeout=REQUEST_TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+    count_retries(response)
+
+    if response.status_code == 304:
+        changed = cache.stage(url, entry)
+        count("http_cache", result="not_modified")
+        content = cache.body(url) if parse_unchanged else None
+    else:
+        changed = cache.stage(url, entry, response)
+        count("http_cache", result="changed" if changed else "same_content")
+        content = response.content if changed or parse_unchanged else None
+    return (parse_html(content, url) if content is not None else None), changed
+
+
+def element_text(element) -> str:
+    """Returns the text content of an lxml element, collapsing whitespace within each line like WebElement.text."""
+    lines = (" ".join(line.split()) for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
@@ -4,12 +4,63 @@ from selenium.webdriver.common.by import By
 import logging
 
 from linkedin_scraper.document.job_document import JobDocument
+from linkedin_scraper.metrics import count, timer
 from linkedin_scraper.scraper.base_scraper import BaseScraper
 
-class JobScraper(BaseScraper):
-    # Static variable to store the method for loading job description across instances
-    job_description_class = None
+# Reads every field of a job detail page in one WebDriver round trip, with the same layout fallbacks as
+# scrape_data_from_elements. Returns null if the top card has not rendered.
+EXTRACT_JOB_SCRIPT = """
+    const byClass = (name, base = document) => base.getElementsByClassName(name)[0];
+    const text = (elem) => elem ? elem.innerText.trim() : null;
+    const byXPath = (path, base) =>
+        document.evaluate(path, base, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+
+    const titleContainer = byClass("job-details-jobs-unified-top-card__job-title");
+    if (!titleContainer) return null;
+
+    const companyElement = byClass("job-details-jobs-unified-top-card__company-name");
+    const companyLink = companyElement ? companyElement.getElementsByTagName("a")[0] : null;
+
+    const descriptionContainer = byClass("job-details-jobs-unified-top-card__primary-description-container");
+    let location = null;
+    let postedDate = null;
+    if (descriptionContainer) {
+        location = text(byXPath(".//div[1]/span[1]", descriptionContainer));
+        const dateContainer = byXPath(".//div[1]/span[3]", descriptionContainer);
+        if (dateContainer) {
+            const spans = Array.from(dateContainer.children).filter(child => child.tagName === "SPAN");
+            if (spans.length === 2) postedDate = text(spans[1]);
+            else if (spans.length === 1) postedDate = text(spans[0]);
+            else postedDate = text(byXPath("./strong/span", dateContainer));
+        }
+    }
+
+    let jobDescription = "";
+    for (const className of ["jobs-description", "feed-shared-inline-show-more-text"]) {
+        const descriptionElement = byClass(className);
+        if (!descriptionElement) continue;
+        const showMoreButton = descriptionElement.getElementsByTagName("button")[0];
+        if (showMoreButton) showMoreButton.click();
+        jobDescription = text(descriptionElement);
+        if (className === "feed-shared-inline-show-more-text") {
+            const extraRequirements = byClass("job-details-about-the-job-module__section");
+            if (extraRequirements) jobDescription += " ||| " + text(extraRequirements);
+        }
+        break;
+    }
+
+    return {
+        job_title: text(titleContainer.getElementsByTagName("h1")[0]),
+        company: companyLink ? text(companyLink) : text(companyElement),
+        company_linkedin_url: companyLink ? companyLink.href : null,
+        location: location,
+        posted_date: postedDate,
+        job_description: jobDescription,
+    };
+"""
 
+
+class JobScraper(BaseScraper):
     def __init__(
             self,
             linkedin_url=None,
@@ -64,8 +115,29 @@ class JobScraper(BaseScraper):
     def scrape_data_from_linkedin_url(self, close_on_complete=True):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
         self.focus()
+        self.wait_for_element_to_load(name="job-details-jobs-unified-top-card__job-title", timeout=self.PAGE_LOAD_TIMEOUT)
+
+        with timer("job_extract"):
+            job_data = driver.execute_script(EXTRACT_JOB_SCRIPT)
+        if job_data and job_data.get("job_title"):
+            self.job_title = job_data["job_title"]
+            self.company = job_data["company"]
+            self.company_linkedin_url = job_data["company_linkedin_url"]
+            self.location = job_data["location"]
+            self.posted_date = job_data["posted_date"]
+            self.job_description = job_data["job_description"]
+        else:
+            logging.warning(f"One-shot extraction failed for {self.linkedin_url}, falling back to element lookups")
+            count("extraction_fallbacks", stage="job_extract")
+            with timer("job_extract_fallback"):
+                self.scrape_data_from_elements()
+
+        if close_on_complete:
+            driver.close()
+
+    def scrape_data_from_elements(self):
         self.job_title = self.wait_for_element_to_load(
             name="job-details-jobs-unified-top-card__job-title").find_element(By.TAG_NAME, "h1").text.strip()
 
@@ -103,30 +175,20 @@ class JobScraper(BaseScraper):
         previous_log_level = selenium_logger.getEffectiveLevel()
         selenium_logger.setLevel(logging.ERROR)
 
-        if JobScraper.job_description_class is None:
+        job_description_class = None
+        for class_name in ("jobs-description", "feed-shared-inline-show-more-text"):
             try:
-                job_description_elem = self.wait_for_element_to_load(name="jobs-description")
-                self.mouse_click(job_description_elem.find_element(By.TAG_NAME, "button"))
-                job_description_elem.find_element(By.TAG_NAME, "button").click()
-                JobScraper.job_description_class = "jobs-description"
+                job_description_elem = self.wait_for_element_to_load(name=class_name)
+                show_more_button = job_description_elem.find_element(By.TAG_NAME, "button")
+                self.mouse_click(show_more_button)
+                show_more_button.click()
                 self.job_description = job_description_elem.text.strip()
+                job_description_class = class_name
+                break
             except (NoSuchElementException, TimeoutException):
-                try:
-                    job_description_elem = self.wait_for_element_to_load(name="feed-shared-inline-show-more-text")
-                    show_more_button = job_description_elem.find_element(By.TAG_NAME, "button")
-                    self.mouse_click(show_more_button)
-                    show_more_button.click()
-                    JobScraper.job_description_class = "feed-shared-inline-show-more-text"
-                    self.job_description = job_description_elem.text.strip()
-                except (NoSuchElementException, TimeoutException):
-                    self.job_description = ""
-        else:
-            job_description_elem = self.wait_for_element_to_load(name=JobScraper.job_description_class)
-            self.mouse_click(job_description_elem.find_element(By.TAG_NAME, "button"))
-            job_description_elem.find_element(By.TAG_NAME, "button").click()
-            self.job_description = job_description_elem.text.strip()
+                self.job_description = ""
 
-        if JobScraper.job_description_class == "feed-shared-inline-show-more-text":
+        if job_description_class == "feed-shared-inline-show-more-text":
             try:
                 extra_requirements = self.wait_for_element_to_load(name="job-details-about-the-job-module__section")
                 self.job_description += " ||| " + extra_requirements.text.strip()
@@ -135,9 +197,6 @@ class JobScraper(BaseScraper):
 
         selenium_logger.setLevel(previous_log_level)
 
-        if close_on_complete:
-            driver.close()
-
 def extract_job_id(url: str) -> int:
     # Regular expression to find the job ID
     match = re.search(r'linkedin.com/jobs/view/(\d+)', url)
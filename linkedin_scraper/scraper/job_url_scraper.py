@@ -1,41 +1,59 @@
+import itertools
 import logging
 import os
 import sys
-from typing import List
-from time import sleep
+from typing import Iterator, List, NamedTuple, Optional
 import urllib.parse
-import pandas as pd
 
-from linkedin_scraper import JobScraper
+from linkedin_scraper.scraper.job_scraper import extract_job_id
 from linkedin_scraper.scraper.base_scraper import BaseScraper
-from linkedin_scraper.document.job_document import JobDocument
+from linkedin_scraper.csv_sink import reset_csv, JOB_HEADERS
+from linkedin_scraper.metrics import count, timer
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 
+# Reads the title link, title and company of every card in a results list in one WebDriver round trip
+EXTRACT_JOB_CARDS_SCRIPT = """
+    const text = (elem) => elem ? elem.innerText.trim() : null;
+    return Array.from(arguments[0].getElementsByClassName("job-card-list")).map(card => {
+        const title = card.getElementsByClassName("job-card-list__title")[0];
+        const company = card.getElementsByClassName("artdeco-entity-lockup__subtitle")[0];
+        return {linkedin_url: title ? title.href : null, job_title: text(title), company: text(company)};
+    });
+"""
+
+
+class JobListing(NamedTuple):
+    """A job card from the search results: just enough to scrape its detail page later."""
+    linkedin_job_id: int
+    linkedin_url: str
+    job_title: Optional[str] = None
+    company: Optional[str] = None
+
+    @classmethod
+    def from_url(cls, linkedin_url: str, job_title: str = None, company: str = None):
+        return cls(extract_job_id(linkedin_url), linkedin_url, job_title, company)
+
+
 class JobUrlScraper(BaseScraper):
     AREAS = ["recommended_jobs", None, "still_hiring", "more_jobs"]
+    JOB_LISTING_CLASS_NAME = "jobs-search-results-list"
 
     def __init__(self, driver, base_url="https://www.linkedin.com/jobs/", close_on_complete=False, scrape=True,
-                 scrape_recommended_jobs=True, csv_filename="linkedin_jobs.csv"):
+                 scrape_recommended_jobs=True, csv_filename=None, seen_jobs=None):
         super().__init__()
         self.driver = driver
+        self.seen_jobs = seen_jobs
         self.base_url = base_url
         self.csv_filename = csv_filename
-        self.create_or_reset_csv()
+        if csv_filename:
+            self.create_or_reset_csv()
         if scrape:
             self.scrape(scrape_recommended_jobs)
 
     def create_or_reset_csv(self):
-        while True:
-            try:
-                if os.path.exists(self.csv_filename):
-                    os.remove(self.csv_filename)
-                pd.DataFrame(
-                    columns=["linkedin_job_id", "linkedin_url", "job_title", "company", "company_linkedin_url", "location", "posted_date",
-                             "job_description", "search_query", "search_date"]).to_csv(self.csv_filename, index=False)
-                logging.info("CSV file created or reset successfully.")
-                break
-            except PermissionError:
-                input("Please close " + self.csv_filename + " (probably in Excel) and press Enter to retry...")
+        reset_csv(self.csv_filename, JOB_HEADERS)
+        logging.info("CSV file created or reset successfully.")
 
     def scrape(self, scrape_recommended_jobs=True):
         if self.is_signed_in():
@@ -43,18 +61,45 @@ class JobUrlScraper(BaseScraper):
         else:
             raise NotImplementedError("This part is not implemented yet")
 
-    def scrape_linkedin_url(self, base_element) -> JobScraper:
+    def scrape_linkedin_url(self, base_element) -> JobListing:
         job_div = self.wait_for_element_to_load(name="job-card-list__title", base=base_element)
-        linkedin_url = job_div.get_attribute("href")
-        return JobScraper(linkedin_url=linkedin_url, scrape=False, driver=self.driver)
+        return JobListing.from_url(job_div.get_attribute("href"))
+
+    def scrape_linkedin_urls(self, job_listing) -> List[JobListing]:
+        with timer("job_cards_extract"):
+            job_cards = self.driver.execute_script(EXTRACT_JOB_CARDS_SCRIPT, job_listing)
+        if not job_cards:
+            count("extraction_fallbacks", stage="job_cards_extract")
+            return self.filter_seen_jobs([
+                self.scrape_linkedin_url(job_card)
+                for job_card in self.wait_for_all_elements_to_load(name="job-card-list", base=job_listing)
+            ])
+
+        job_results = []
+        for job_card in job_cards:
+            if not job_card["linkedin_url"]:
+                logging.warning("Skipping job card that has not rendered its title link")
+                continue
+            job_results.append(JobListing.from_url(job_card["linkedin_url"], job_card["job_title"], job_card["company"]))
+        return self.filter_seen_jobs(job_results)
+
+    def filter_seen_jobs(self, job_results: List[JobListing]) -> List[JobListing]:
+        """Drops jobs that are already stored (or were already collected this run) when a seen-job index is set."""
+        if self.seen_jobs is None:
+            return job_results
+
+        new_jobs = []
+        for job in job_results:
+            if self.seen_jobs.add_if_new(job.linkedin_job_id):
+                new_jobs.append(job)
+        logging.info(f"Skipping {len(job_results) - len(new_jobs)} already seen jobs")
+        return new_jobs
 
     def scrape_logged_in(self, scrape_recommended_jobs=True):
-        driver = self.driver
-        driver.get(self.base_url)
+        self.load_page(self.base_url)
         if scrape_recommended_jobs:
             self.focus()
-            sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-            job_area = self.wait_for_element_to_load(name="scaffold-finite-scroll__content")
+            job_area = self.wait_for_element_to_load(name="scaffold-finite-scroll__content", timeout=self.PAGE_LOAD_TIMEOUT)
             areas = self.wait_for_all_elements_to_load(name="artdeco-card", base=job_area)
             for i, area in enumerate(areas):
                 area_name = self.AREAS[i]
@@ -67,99 +112,70 @@ class JobUrlScraper(BaseScraper):
                 setattr(self, area_name, area_results)
         return
 
-    def search_jobs_page_for_linkedin_urls(self, search_term: str, click_to_first_page: bool = True) -> List[JobScraper]:
+    def search_jobs_page_for_linkedin_urls(self, search_term: str, click_to_first_page: bool = True) -> List[JobListing]:
         if click_to_first_page:
             url = os.path.join(self.base_url, "search") + f"?keywords={urllib.parse.quote(search_term)}&refresh=true"
-            self.driver.get(url)
+            self.load_page(url)
 
         self.scroll_to_bottom()
         self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-
-        job_listing_class_name = "jobs-search-results-list"
-        job_listing = self.wait_for_element_to_load(name=job_listing_class_name)
-
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 0.3)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 0.6)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 1)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
 
-        job_results = []
-        for job_card in self.wait_for_all_elements_to_load(name="job-card-list", base=job_listing):
-            job = self.scrape_linkedin_url(job_card)
-            job_results.append(job)
-        return job_results
-
-    def search_jobs_pages_for_linkedin_urls(self, search_term: str, max_pages: int = sys.maxsize) -> List[JobScraper]:
-        try:
-            return self.search_jobs_pages_for_linkedin_urls_with_next_button_pagination(search_term, max_pages)
-        except:
-            return self.search_jobs_pages_for_linkedin_urls_with_ellipsis_button_pagination(search_term, max_pages)
-
-    def search_jobs_pages_for_linkedin_urls_with_next_button_pagination(self, search_term: str, max_pages: int) -> List[JobScraper]:
-        url = os.path.join(self.base_url, "search") + f"?keywords={urllib.parse.quote(search_term)}&refresh=true"
-        self.driver.get(url)
-
-        try:
-            logging.disable(logging.CRITICAL)
-            next_button = self.driver.find_element(By.XPATH, "//button[@aria-label='View next page']")
-            logging.disable(logging.NOTSET)
-        except Exception as e:
-            raise e
+        job_listing = self.wait_for_element_to_load(name=self.JOB_LISTING_CLASS_NAME, timeout=self.PAGE_LOAD_TIMEOUT)
 
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-        all_job_results = []
-        current_page = 1
+        # Cards only render their title link once scrolled into view, so scroll until the count settles
+        self.scroll_class_name_element_until_stable(self.JOB_LISTING_CLASS_NAME, "job-card-list__title")
 
-        while current_page <= max_pages:
-            job_results = self.search_jobs_page_for_linkedin_urls(search_term, False)
-            all_job_results.extend(job_results)
-            next_button = self.driver.find_element(By.XPATH, "//button[@aria-label='View next page']")
-            if next_button:
-                next_button.click()
-                current_page += 1
-                sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-            else:
-                break
+        return self.scrape_linkedin_urls(job_listing)
 
-        return all_job_results
+    def search_jobs_pages_for_linkedin_urls(self, search_term: str, max_pages: int = sys.maxsize) -> List[JobListing]:
+        return list(itertools.chain.from_iterable(self.iter_jobs_pages_for_linkedin_urls(search_term, max_pages)))
 
-    def search_jobs_pages_for_linkedin_urls_with_ellipsis_button_pagination(self, search_term: str, max_pages: int) -> List[JobScraper]:
+    def iter_jobs_pages_for_linkedin_urls(self, search_term: str, max_pages: int = sys.maxsize) -> Iterator[List[JobListing]]:
+        """
+        Yields the listings of each results page as soon as it is read, so their detail pages can be scraped
+        (on other sessions) while later pages are still loading.
+        """
         url = os.path.join(self.base_url, "search") + f"?keywords={urllib.parse.quote(search_term)}&refresh=true"
-        self.driver.get(url)
+        self.load_page(url)
         self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+        self.wait_for_element_to_load(name=self.JOB_LISTING_CLASS_NAME, timeout=self.PAGE_LOAD_TIMEOUT)
 
-        all_job_results = []
         current_page = 1
-
-        while current_page <= max_pages:
-            job_results = self.search_jobs_page_for_linkedin_urls(search_term, False)
-            all_job_results.extend(job_results)
-
-            try:
-                pagination_container = self.driver.find_element(By.CLASS_NAME, "jobs-search-results-list__pagination")
-                selected_button = pagination_container.find_element(By.XPATH, ".//li[contains(@class, 'active')]/button")
-                next_li = selected_button.find_element(By.XPATH, "../following-sibling::li/button")
-
-                if next_li and current_page < max_pages:
-                    next_li.click()
-                    current_page += 1
-                    sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-                else:
-                    break
-            except Exception:
+        while True:
+            yield self.search_jobs_page_for_linkedin_urls(search_term, False)
+            if current_page >= max_pages:
                 break
-
-        return all_job_results
+            next_button = self.find_next_page_button()
+            if next_button is None or not self.click_and_wait_for_next_page(next_button):
+                break
+            current_page += 1
+
+    def find_next_page_button(self):
+        """
+        Returns the "View next page" button, or the page button after the active one in the ellipsis layout.
+        Disabled buttons (on the last page) are skipped.
+        """
+        enabled = "not(@disabled) and not(@aria-disabled='true')"
+        try:
+            return self.driver.find_element(By.XPATH, f"//button[@aria-label='View next page' and {enabled}]")
+        except NoSuchElementException:
+            pass
+        try:
+            pagination_container = self.driver.find_element(By.CLASS_NAME, "jobs-search-results-list__pagination")
+            selected_button = pagination_container.find_element(By.XPATH, ".//li[contains(@class, 'active')]/button")
+            return selected_button.find_element(By.XPATH, f"../following-sibling::li[1]/button[{enabled}]")
+        except NoSuchElementException:
+            return None
+
+    def click_and_wait_for_next_page(self, pagination_button) -> bool:
+        """Returns False if the results didn't change after the click, i.e. there is no next page to read."""
+        # The results list re-renders on pagination, so a card from the current page going stale marks the switch
+        first_card = self.driver.find_element(By.CLASS_NAME, "job-card-list")
+        pagination_button.click()
+        if not self.wait_for_staleness(first_card):
+            return False
+        self.wait_for_element_to_load(name="job-card-list", timeout=self.PAGE_LOAD_TIMEOUT)
+        return True
 
     @staticmethod
     def extract_job_id(url: str) -> int:
@@ -1,14 +1,47 @@
 import logging
+from typing import List, Tuple
+
+import requests
+from bson import ObjectId
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from linkedin_scraper.document.enums.breadth_category import BreadthCategory
 from linkedin_scraper.document.subject_document import SubjectDocument
+from linkedin_scraper.metrics import count, timer
 from linkedin_scraper.scraper.base_scraper import BaseScraper
+from linkedin_scraper.scraper.http_cache import HttpCache
+from linkedin_scraper.scraper.http_session import fetch_html, fetch_html_if_changed, element_text
+
+
+def build_subject_document(link: str, link_text: str, breadth_category_text: str) -> SubjectDocument:
+    subject_code = link.split("Subject=")[1].split("&")[0]
+    subject_name = link_text.strip()
+
+    # Parse breadth categories (can be one or multiple)
+    raw_categories = breadth_category_text.strip().split(" ")
+    breadth_categories = []
+    for category in raw_categories:
+        if category == "A":
+            breadth_categories.append(BreadthCategory.A)
+        elif category == "B":
+            breadth_categories.append(BreadthCategory.B)
+        elif category == "C":
+            breadth_categories.append(BreadthCategory.C)
+
+    # Convert to structured SubjectDocument
+    return SubjectDocument(
+        subject_name=subject_name,
+        subject_code=subject_code,
+        course_list_url=link,
+        breadth_categories=[c.value for c in breadth_categories],
+    )
 
 
 class SubjectScraper(BaseScraper):
     URL = "https://www.westerncalendar.uwo.ca/Courses.cfm?SelectedCalendar=Live"
+    # Rows whose first cell links to a subject; the served HTML has no tbody and DataTables adds the table id in the browser
+    SUBJECT_ROWS_XPATH = "//table//tr[td[1]/a[contains(@href, 'Subject=')]]"
 
     def __init__(self, driver: WebDriver):
         super().__init__(driver=driver)
@@ -22,39 +55,68 @@ class SubjectScraper(BaseScraper):
         """Scrapes all subjects and their associated course URLs."""
         subjects = []
         try:
-            driver.get(SubjectScraper.URL)
-            subject_rows = driver.find_elements(By.XPATH, "//table[@id='DataTables_Table_0']/tbody/tr")
+            with timer("page_load"):
+                driver.get(SubjectScraper.URL)
+            subject_rows = driver.find_elements(By.XPATH, SubjectScraper.SUBJECT_ROWS_XPATH)
             for row in subject_rows:
                 try:
                     # Extract subject details from the row
                     link_element = row.find_element(By.XPATH, "./td[1]/a")
-                    link = link_element.get_attribute("href")
-                    subject_code = link.split("Subject=")[1].split("&")[0]
-                    subject_name = link_element.text.strip()
-
-                    # Parse breadth categories (can be one or multiple)
                     breadth_category_element = row.find_element(By.XPATH, "./td[2]")
-                    raw_categories = breadth_category_element.text.strip().split(" ")
-                    breadth_categories = []
-                    for category in raw_categories:
-                        if category == "A":
-                            breadth_categories.append(BreadthCategory.A)
-                        elif category == "B":
-                            breadth_categories.append(BreadthCategory.B)
-                        elif category == "C":
-                            breadth_categories.append(BreadthCategory.C)
-
-                    # Convert to structured SubjectDocument
-                    subject_document = SubjectDocument(
-                        subject_name=subject_name,
-                        subject_code=subject_code,
-                        course_list_url = link,
-                        breadth_categories=[c.value for c in breadth_categories],
-                    )
-                    subjects.append(subject_document)
+                    subjects.append(build_subject_document(
+                        link_element.get_attribute("href"), link_element.text, breadth_category_element.text
+                    ))
 
                 except Exception as e:
+                    count("errors", stage="subject_row", error=type(e).__name__)
                     logging.error(f"Error processing row: {e}")
         except Exception as e:
             logging.error(f"Error scraping all subjects: {e}")
-        return subjects
\ No newline at end of file
+        return subjects
+
+    @staticmethod
+    def scrape_all_subjects_http(session: requests.Session):
+        """Scrapes all subjects from the server-rendered page without a browser."""
+        try:
+            return SubjectScraper.parse_subjects(fetch_html(session, SubjectScraper.URL))
+        except Exception as e:
+            logging.error(f"Error scraping all subjects: {e}")
+            return []
+
+    @staticmethod
+    def scrape_subjects_if_changed(session: requests.Session, cache: HttpCache) -> Tuple[List[SubjectDocument], bool]:
+        """
+        Scrapes all subjects through cache and returns (subjects, changed). When the page is unchanged the
+        subjects are parsed from the cached copy and get back the ids committed with it.
+        """
+        try:
+            tree, changed = fetch_html_if_changed(session, SubjectScraper.URL, cache, parse_unchanged=True)
+        except Exception as e:
+            logging.error(f"Error scraping all subjects: {e}")
+            return [], True
+
+        subjects = SubjectScraper.parse_subjects(tree)
+        if not changed:
+            subject_ids = cache.entry(SubjectScraper.URL).get("meta", {}).get("subject_ids", {})
+            if all(subject.subject_code in subject_ids for subject in subjects):
+                for subject in subjects:
+                    subject.id = ObjectId(subject_ids[subject.subject_code])
+            else:
+                changed = True
+        return subjects, changed
+
+    @staticmethod
+    def parse_subjects(tree) -> List[SubjectDocument]:
+        subjects = []
+        for row in tree.xpath(SubjectScraper.SUBJECT_ROWS_XPATH):
+            try:
+                link_element = row.xpath("./td[1]/a")[0]
+                breadth_category_element = row.xpath("./td[2]")[0]
+                subjects.append(build_subject_document(
+                    link_element.get("href"), element_text(link_element), element_text(breadth_category_element)
+                ))
+
+            except Exception as e:
+                count("errors", stage="subject_row", error=type(e).__name__)
+                logging.error(f"Error processing row: {e}")
+        return subjects
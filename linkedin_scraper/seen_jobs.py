@@ -0,0 +1,82 @@
+import csv
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+
+def parse_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class SeenJobIndex:
+    """
+    Maps linkedin_job_id to the date it was last scraped so job pages already stored are not fetched again.
+    With refresh_after_days set, jobs last scraped longer ago than that are treated as new and re-scraped.
+    Batch query threads share one index, so claiming a job goes through add_if_new.
+    """
+
+    def __init__(self, refresh_after_days: Optional[int] = None):
+        self.refresh_after_days = refresh_after_days
+        self.last_scraped = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.last_scraped)
+
+    def add(self, job_id: int, scraped_date=None):
+        scraped_date = (parse_date(scraped_date) or date.min) if scraped_date else date.today()
+        with self._lock:
+            if job_id not in self.last_scraped or scraped_date > self.last_scraped[job_id]:
+                self.last_scraped[job_id] = scraped_date
+
+    def add_if_new(self, job_id: int) -> bool:
+        """Marks a job as scraped today if it is new and returns whether it was, as one atomic step."""
+        with self._lock:
+            if not self._is_new(job_id):
+                return False
+            if job_id:
+                self.last_scraped[job_id] = date.today()
+            return True
+
+    def is_new(self, job_id: int) -> bool:
+        with self._lock:
+            return self._is_new(job_id)
+
+    def _is_new(self, job_id: int) -> bool:
+        if not job_id or job_id not in self.last_scraped:
+            return True
+        if self.refresh_after_days is None:
+            return False
+        return date.today() - self.last_scraped[job_id] > timedelta(days=self.refresh_after_days)
+
+    @classmethod
+    def from_mongo(cls, jobs_collection, refresh_after_days: Optional[int] = None):
+        index = cls(refresh_after_days)
+        cursor = jobs_collection.find({}, {"_id": 0, "linkedin_job_id": 1, "search_date": 1}, batch_size=10000)
+        for job in cursor:
+            if job.get("linkedin_job_id"):
+                index.add(job["linkedin_job_id"], job.get("search_date") or date.min)
+        logging.info(f"Loaded {len(index)} seen job ids from MongoDB")
+        return index
+
+    @classmethod
+    def from_csv(cls, filename: str, refresh_after_days: Optional[int] = None):
+        index = cls(refresh_after_days)
+        if os.path.isfile(filename):
+            with open(filename, encoding="utf-8", newline="") as file:
+                for row in csv.DictReader(file):
+                    try:
+                        index.add(int(row["linkedin_job_id"]), row.get("search_date") or date.min)
+                    except (KeyError, TypeError, ValueError):
+                        continue
+        logging.info(f"Loaded {len(index)} seen job ids from {filename}")
+        return index
@@ -1,3 +1,167 @@
+import logging
+import re
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from linkedin_scraper.metrics import count
+from linkedin_scraper.mongo_client import get_database, load_config
+from linkedin_scraper.service.keyword_model import KeywordModel
+from linkedin_scraper.service.keyword_extraction import load_keyword_pipeline, keywords_from_docs
+from linkedin_scraper.service.translation import content_hash
+
+PREREQUISITE_PATTERN = re.compile(
+    r"Pre-?requisites?(?:\(s\))?:\s*(.*?)(?=\s*(?:Co-?requisites?|Anti-?requisites?|Extra Information|\n|$))",
+    re.IGNORECASE | re.DOTALL,
+)
+# Fields process_course_batch writes from a description, copied as-is to re-crawled copies of the course
+RESULT_FIELDS = ("keywords", "prerequisites", "prerequisite_codes")
+# e.g. "Computer Science 1027A/B", "Calculus 1000A/B", "Mathematics 1600"
+COURSE_CODE_PATTERN = re.compile(r"([A-Z][A-Za-z'&]*(?: [A-Z][A-Za-z'&]*)*) (\d{4})([A-Z](?:/[A-Z])*)?")
+
+
+def extract_prerequisites(description: str):
+    """Returns the prerequisite sentence of a course description and the course codes it mentions."""
+    match = PREREQUISITE_PATTERN.search(description or "")
+    if not match:
+        return None, []
+    text = match.group(1).strip()
+    codes = [" ".join(filter(None, (subject, number + (suffix or ""))))
+             for subject, number, suffix in COURSE_CODE_PATTERN.findall(text)]
+    return text, list(dict.fromkeys(codes))
+
+
 class CourseProcessor:
-    def __init__(self):
-        pass
\ No newline at end of file
+    """
+    Extracts keywords and prerequisites from course descriptions, mirroring JobProcessor. Only courses modified
+    since the last run's watermark are read, and of those only the ones whose description hash changed are
+    re-processed; a re-crawled course inserted as a new document copies the results of its processed earlier
+    copy (same subject code, number, suffix and description), so a re-crawl where little changed costs little.
+    """
+    STATE_ID = "course_processor"
+
+    def __init__(self, config_path="config.yaml"):
+        self.config = load_config(config_path)
+
+        logging.info("Initializing CourseProcessor")
+
+        self.db = get_database()
+        self.courses_collection = self.db["courses"]
+        self.state_collection = self.db["processor_state"]
+        self.subject_codes = {}
+
+        processor_config = self.config.get("course_processor", {})
+        self.batch_size = processor_config.get("batch_size", 64)
+        self.fetch_batch_size = processor_config.get("fetch_batch_size", 1000)
+        self.keyword_top_k = processor_config.get("keyword_top_k", 25)
+        self.keyword_model = KeywordModel(processor_config.get("keyword_model_path", "course_keyword_model.joblib"))
+        self.nlp = load_keyword_pipeline(processor_config)
+
+    def get_watermark(self):
+        state = self.state_collection.find_one({"_id": self.STATE_ID})
+        return state["watermark"] if state else None
+
+    def set_watermark(self, watermark):
+        self.state_collection.update_one({"_id": self.STATE_ID}, {"$set": {"watermark": watermark}}, upsert=True)
+
+    def changed_courses(self, watermark):
+        query = {"description": {"$nin": [None, ""]}}
+        if watermark:
+            # Courses never processed are picked up regardless of their modification date
+            query["$or"] = [{"last_modified_date": {"$gt": watermark}}, {"processed_hash": {"$exists": False}}]
+        return self.courses_collection.find(
+            query,
+            {"description": 1, "last_modified_date": 1, "processed_hash": 1, "subject_id": 1, "number": 1, "suffix": 1},
+            batch_size=self.fetch_batch_size,
+        ).sort("last_modified_date", 1)
+
+    def load_subject_codes(self) -> dict:
+        """Maps subject _id to subject_code; ids change with every full crawl, codes don't."""
+        return {subject["_id"]: subject.get("subject_code")
+                for subject in self.db["subjects"].find({}, {"subject_code": 1}, batch_size=self.fetch_batch_size)}
+
+    def course_key(self, course, description_hash):
+        suffix = course.get("suffix")
+        subject_id = course.get("subject_id")
+        return (self.subject_codes.get(subject_id, subject_id), course.get("number"),
+                tuple(suffix) if isinstance(suffix, list) else suffix, description_hash)
+
+    def processed_copies(self, batch) -> dict:
+        """
+        Finds already processed courses with the same subject, number, suffix and description as the batch's,
+        e.g. the previous crawl's copy of a course that was inserted again, keyed like course_key.
+        """
+        cursor = self.courses_collection.find(
+            {"processed_hash": {"$in": list({description_hash for _, _, description_hash, _ in batch})},
+             "_id": {"$nin": [course_id for course_id, _, _, _ in batch]}},
+            {"subject_id": 1, "number": 1, "suffix": 1, "processed_hash": 1, **{field: 1 for field in RESULT_FIELDS}},
+            batch_size=self.fetch_batch_size,
+        )
+        return {self.course_key(course, course["processed_hash"]): course for course in cursor}
+
+    def process_courses(self):
+        logging.info("Starting incremental course processing")
+
+        if not self.keyword_model.load():
+            self.keyword_model.fit_from_collection(self.courses_collection, field="description")
+            self.keyword_model.save()
+
+        self.subject_codes = self.load_subject_codes()
+        watermark = self.get_watermark()
+        new_watermark = watermark
+        batch = []
+        processed = 0
+        for course in self.changed_courses(watermark):
+            if course.get("last_modified_date") and (new_watermark is None or course["last_modified_date"] > new_watermark):
+                new_watermark = course["last_modified_date"]
+
+            description_hash = content_hash(course["description"])
+            if course.get("processed_hash") == description_hash:
+                continue
+            batch.append((course["_id"], course["description"], description_hash, self.course_key(course, description_hash)))
+
+            if len(batch) >= self.fetch_batch_size:
+                processed += self.process_course_batch(batch)
+                batch = []
+        if batch:
+            processed += self.process_course_batch(batch)
+
+        if new_watermark:
+            self.set_watermark(new_watermark)
+        logging.info(f"Processed {processed} changed courses")
+
+    def process_course_batch(self, batch) -> int:
+        updates = []
+        # Re-crawled courses whose description is unchanged take over their processed copy's results
+        copies = self.processed_copies(batch)
+        to_process = []
+        for course_id, description, description_hash, key in batch:
+            copy = copies.get(key)
+            if copy is None:
+                to_process.append((course_id, description, description_hash))
+                continue
+            updates.append(UpdateOne({"_id": course_id}, {"$set": {
+                **{field: copy.get(field) for field in RESULT_FIELDS},
+                "processed_hash": description_hash,
+                "processed_date": datetime.now(timezone.utc),
+            }}))
+        if updates:
+            count("documents_copied", len(updates), collection="courses")
+
+        texts = [description for _, description, _ in to_process]
+        docs = list(self.nlp.pipe(texts, batch_size=self.batch_size))
+        keywords = keywords_from_docs(docs, texts, self.keyword_model, self.keyword_top_k) if texts else []
+
+        for (course_id, description, description_hash), course_keywords in zip(to_process, keywords):
+            prerequisites_text, prerequisite_codes = extract_prerequisites(description)
+            updates.append(UpdateOne({"_id": course_id}, {"$set": {
+                "keywords": course_keywords,
+                "prerequisites": prerequisites_text,
+                "prerequisite_codes": prerequisite_codes,
+                "processed_hash": description_hash,
+                "processed_date": datetime.now(timezone.utc),
+            }}))
+
+        if updates:
+            self.courses_collection.bulk_write(updates, ordered=False)
+        return len(updates)
@@ -1,17 +1,18 @@
-import yaml
 import logging
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from linkedin_scraper.mongo_client import get_database
+from linkedin_scraper.metrics import count, timed, timer
+from linkedin_scraper.mongo_client import get_database, load_config
+from linkedin_scraper.service.keyword_model import KeywordModel
+from linkedin_scraper.service.keyword_extraction import load_keyword_pipeline, keywords_from_docs
+from linkedin_scraper.service.translation import TranslationCache, TRANSLATOR_BACKENDS, content_hash
 from langdetect import detect
-from googletrans import Translator
 from bson import ObjectId
+from pymongo import UpdateOne
 
 
 class JobProcessor:
-    def __init__(self, config_path="config.yaml"):
-        with open(config_path) as file:
-            self.config = yaml.safe_load(file)
+    def __init__(self, config_path="config.yaml", translator=None, config=None, db=None):
+        """config and db default to config.yaml and the shared MongoDB database; pass them to run without either."""
+        self.config = config if config is not None else load_config(config_path)
 
         if self.config.get("logging", {}).get("enabled", False):
             logging_level = self.config["logging"].get("level", "INFO").upper()
@@ -21,53 +22,96 @@ class JobProcessor:
 
         logging.info("Initializing JobTokenizer")
 
-        self.db = get_database()
+        self.db = db if db is not None else get_database()
         self.jobs_collection = self.db["jobs"]
 
-        self.nlp = spacy.load("en_core_web_sm")
-        self.translator = Translator()  # Initialize Google Translator
-
+        processor_config = self.config.get("job_processor", {})
+        self.batch_size = processor_config.get("batch_size", 64)
+        self.n_process = processor_config.get("n_process", 1)
+        self.fetch_batch_size = processor_config.get("fetch_batch_size", 1000)
+        self.keyword_top_k = processor_config.get("keyword_top_k", 25)
+        self._keyword_model = KeywordModel(processor_config.get("keyword_model_path", "keyword_model.joblib"))
+
+        self.nlp = load_keyword_pipeline(processor_config)
+        self.translator = translator or TRANSLATOR_BACKENDS[processor_config.get("translator", "GOOGLE").upper()]()
+        self.translation_cache = TranslationCache(
+            processor_config.get("translation_cache_path", "translation_cache.db"),
+            processor_config.get("translation_cache_max_entries", 100000),
+        )
+
+    @timed("translate")
     def detect_and_translate(self, text):
+        key = content_hash(text)
+        cached = self.translation_cache.get(key)
+        # French text cached untranslated (by a NONE translator run before such results were kept out) is a miss
+        if cached and not (cached[0] == "fr" and cached[1] == text):
+            count("translation_cache_hits")
+            return cached[1]
+
         try:
             # Detect language
             language = detect(text)
             if language == "fr":  # If text is in French
                 logging.info("Translating job description from French to English")
-                translated_text = self.translator.translate(text, src="fr", dest="en").text
+                translated_text = self.translator.translate(text, src="fr", dest="en")
+                if self.translator.cache_translations:
+                    self.translation_cache.put(key, language, translated_text)
                 return translated_text
+            self.translation_cache.put(key, language, text)
         except Exception as e:
+            # Failures aren't cached so the next run retries them
+            count("errors", stage="translate", error=type(e).__name__)
             logging.error(f"Error detecting or translating language: {e}")
 
         return text  # Return original text if not in French or on failure
 
+    @property
+    def keyword_model(self) -> KeywordModel:
+        """The corpus-level TF-IDF model, loaded from disk or fitted over the jobs collection on first use."""
+        if not self._keyword_model.is_fitted and not self._keyword_model.load():
+            self.fit_keyword_model()
+        return self._keyword_model
+
+    def fit_keyword_model(self):
+        self._keyword_model.fit_from_collection(self.jobs_collection)
+        self._keyword_model.save()
+
     def extract_keywords(self, text):
-        doc = self.nlp(text)
-        keywords = [ent.text for ent in doc.ents if ent.label_ in [
-            "SKILL", "PROGRAMMING_LANGUAGE", "FRAMEWORK", "LIBRARY",
-            "DATABASE", "CLOUD_SERVICE", "DEVOPS_TOOL", "SOFTWARE_TOOL",
-            "OPERATING_SYSTEM", "METHODOLOGY", "DATA_STRUCTURE", "ALGORITHM",
-            "DESIGN_PATTERN", "VERSION_CONTROL", "TESTING_FRAMEWORK", "CODE_REVIEW_TOOL",
-            "BUILD_TOOL", "API_TECHNOLOGY", "SECURITY_PROTOCOL", "NETWORKING_TECH",
-            "FRONTEND_TECH", "BACKEND_TECH", "DATA_ANALYSIS_TOOL", "CONTAINERIZATION",
-            "ORCHESTRATION", "MACHINE_LEARNING_LIB"
-        ]]
-
-        if len(keywords) < 5:
-            tfidf = TfidfVectorizer(max_features=25, stop_words="english")
-            tfidf.fit_transform([text])
-            keywords.extend(tfidf.get_feature_names_out().tolist())
-
-        return list(set(keywords))  # Return unique keywords
+        return self.keywords_from_docs([self.nlp(text)], [text])[0]
+
+    def keywords_from_docs(self, docs, texts):
+        return keywords_from_docs(docs, texts, self.keyword_model, self.keyword_top_k)
 
     def process_jobs(self, job_ids):
         logging.info("Starting Keyword Extraction for specified job descriptions")
 
-        for job_id in job_ids:
-            job = self.jobs_collection.find_one({"_id": ObjectId(job_id)})
-            if not job:
+        for start in range(0, len(job_ids), self.fetch_batch_size):
+            self.process_job_batch(job_ids[start:start + self.fetch_batch_size])
+
+        logging.info("Keyword extraction and MongoDB update complete!")
+
+    def process_job_batch(self, job_ids):
+        """Fetches a batch of jobs with one query, runs them through nlp.pipe and writes the results in one bulk_write."""
+        object_ids = [ObjectId(job_id) for job_id in job_ids]
+        jobs = {
+            job["_id"]: job
+            for job in self.jobs_collection.find({"_id": {"$in": object_ids}}, {"job_description": 1, "is_duplicate": 1})
+        }
+        for job_id in object_ids:
+            if job_id not in jobs:
                 logging.warning(f"Job with ID {job_id} not found.")
-                continue
 
+        self.process_job_documents([jobs[job_id] for job_id in object_ids if job_id in jobs])
+
+    def process_job_documents(self, jobs):
+        """Processes job documents that are already in memory (they need _id and job_description)."""
+        to_analyze = []
+        for job in jobs:
+            job_id = job["_id"]
+            # Near-duplicates share their canonical job's analysis (see canonical_job_id)
+            if job.get("is_duplicate"):
+                count("duplicates_skipped", collection="jobs")
+                continue
             job_description = job.get("job_description", "")
             if not job_description:
                 logging.warning(f"Job ID {job_id} has no job description.")
@@ -75,20 +119,25 @@ class JobProcessor:
 
             # Detect and translate if necessary
             translated_description = self.detect_and_translate(job_description)
+            to_analyze.append((job_id, job_description, translated_description))
 
-            # Use translated description for keywords if translation occurred
-            description_to_analyze = translated_description if translated_description != job_description else job_description
-            keywords = self.extract_keywords(description_to_analyze)
+        texts = [translated_description for _, _, translated_description in to_analyze]
+        with timer("nlp"):
+            docs = list(self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process))
+        with timer("keywords"):
+            doc_keywords = self.keywords_from_docs(docs, texts)
+
+        updates = []
+        for (job_id, job_description, translated_description), keywords in zip(to_analyze, doc_keywords):
             logging.info(f"Extracted keywords for Job ID {job_id}: {keywords}")
 
             # Update MongoDB with keywords and translated description if necessary
             update_data = {"keywords": keywords}
             if translated_description != job_description:
                 update_data["translated_description"] = translated_description
+            updates.append(UpdateOne({"_id": job_id}, {"$set": update_data}))
 
-            self.jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": update_data}
-            )
-
-        logging.info("Keyword extraction and MongoDB update complete!")
+        if updates:
+            with timer("mongo_update"):
+                self.jobs_collection.bulk_write(updates, ordered=False)
+            count("documents_processed", len(updates), collection="jobs")
@@ -0,0 +1,40 @@
+import spacy
+from linkedin_scraper.service.keyword_model import KeywordModel
+from linkedin_scraper.service.skill_matcher import build_skill_pipeline, DEFAULT_TAXONOMY_PATH
+
+# With the NER keyword pipeline only doc.ents is read, so everything but the NER (and the tok2vec it
+# listens to) is skipped
+UNUSED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+KEYWORD_LABELS = {
+    "SKILL", "PROGRAMMING_LANGUAGE", "FRAMEWORK", "LIBRARY",
+    "DATABASE", "CLOUD_SERVICE", "DEVOPS_TOOL", "SOFTWARE_TOOL",
+    "OPERATING_SYSTEM", "METHODOLOGY", "DATA_STRUCTURE", "ALGORITHM",
+    "DESIGN_PATTERN", "VERSION_CONTROL", "TESTING_FRAMEWORK", "CODE_REVIEW_TOOL",
+    "BUILD_TOOL", "API_TECHNOLOGY", "SECURITY_PROTOCOL", "NETWORKING_TECH",
+    "FRONTEND_TECH", "BACKEND_TECH", "DATA_ANALYSIS_TOOL", "CONTAINERIZATION",
+    "ORCHESTRATION", "MACHINE_LEARNING_LIB"
+}
+
+
+def load_keyword_pipeline(processor_config: dict):
+    # The gazetteer labels skills from a taxonomy; en_core_web_sm's NER never produces KEYWORD_LABELS itself
+    if processor_config.get("keyword_pipeline", "GAZETTEER").upper() == "NER":
+        return spacy.load("en_core_web_sm", disable=UNUSED_PIPES)
+    return build_skill_pipeline(
+        processor_config.get("skill_taxonomy_path", DEFAULT_TAXONOMY_PATH),
+        processor_config.get("skill_pipeline_cache_dir", "skill_pipeline"),
+    )
+
+
+def keywords_from_docs(docs, texts, keyword_model: KeywordModel, top_k=25):
+    keywords = [[ent.text for ent in doc.ents if ent.label_ in KEYWORD_LABELS] for doc in docs]
+
+    # Top up documents with too few entities from the TF-IDF model (if there was a corpus to fit it on),
+    # all in one transform
+    needs_tfidf = [idx for idx, doc_keywords in enumerate(keywords) if len(doc_keywords) < 5]
+    if needs_tfidf and keyword_model.is_fitted:
+        tfidf_keywords = keyword_model.top_keywords([texts[idx] for idx in needs_tfidf], top_k)
+        for idx, doc_tfidf_keywords in zip(needs_tfidf, tfidf_keywords):
+            keywords[idx].extend(doc_tfidf_keywords)
+
+    return [list(set(doc_keywords)) for doc_keywords in keywords]  # Return unique keywords
@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import Iterable, List
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def build_vectorizer(n_documents: int, max_features: int, min_df, max_df) -> TfidfVectorizer:
+    """The TF-IDF vectorizer shared by the keyword model and the relevance index."""
+    # A tiny corpus can't satisfy min_df/max_df, so fall back to keeping every term
+    small_corpus = n_documents < 10
+    return TfidfVectorizer(
+        stop_words="english",
+        max_features=max_features,
+        min_df=1 if small_corpus else min_df,
+        max_df=1.0 if small_corpus else max_df,
+        sublinear_tf=True,
+        dtype=np.float32,
+    )
+
+
+class KeywordModel:
+    """
+    TF-IDF model fitted once over the whole jobs corpus and persisted to disk, so IDF weights reflect how
+    discriminative a term is across postings. Keywords for a batch of descriptions are read off the sparse
+    matrix in one vectorized pass.
+    """
+
+    def __init__(self, path="keyword_model.joblib", max_features=50000, min_df=2, max_df=0.8):
+        self.path = path
+        self.max_features = max_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.vectorizer = None
+        self.feature_names = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    def fit(self, texts: Iterable[str]):
+        texts = [text for text in texts if text]
+        if not texts:
+            logging.warning("No documents to fit the keyword model on, leaving it unfitted")
+            return self
+        self.vectorizer = build_vectorizer(len(texts), self.max_features, self.min_df, self.max_df)
+        self.vectorizer.fit(texts)
+        self.feature_names = self.vectorizer.get_feature_names_out()
+        logging.info(f"Fitted keyword model on {len(texts)} documents with {len(self.feature_names)} terms")
+        return self
+
+    def fit_from_collection(self, collection, field="job_description"):
+        cursor = collection.find({field: {"$nin": [None, ""]}}, {field: 1, "_id": 0}, batch_size=1000)
+        return self.fit(document[field] for document in cursor)
+
+    def save(self):
+        if not self.is_fitted:
+            return
+        joblib.dump(self.vectorizer, self.path)
+        logging.info(f"Saved keyword model to {self.path}")
+
+    def load(self) -> bool:
+        if not os.path.isfile(self.path):
+            return False
+        self.vectorizer = joblib.load(self.path)
+        self.feature_names = self.vectorizer.get_feature_names_out()
+        logging.info(f"Loaded keyword model from {self.path}")
+        return True
+
+    def transform(self, texts: List[str]):
+        return self.vectorizer.transform(texts)
+
+    def top_keywords(self, texts: List[str], k: int = 25) -> List[List[str]]:
+        """Returns the k highest weighted terms of each text, best first."""
+        return self.top_keywords_from_matrix(self.transform(texts), k)
+
+    def top_keywords_from_matrix(self, matrix, k: int = 25) -> List[List[str]]:
+        matrix = matrix.tocsr()
+        n_rows = matrix.shape[0]
+        row_ids = np.repeat(np.arange(n_rows), np.diff(matrix.indptr))
+
+        # Sort the non-zeros by row, then by descending weight, and keep the first k of each row
+        order = np.lexsort((-matrix.data, row_ids))
+        rank_in_row = np.arange(len(order)) - matrix.indptr[row_ids[order]]
+        keep = order[rank_in_row < k]
+
+        keywords = [[] for _ in range(n_rows)]
+        for row, term in zip(row_ids[keep], self.feature_names[matrix.indices[keep]]):
+            keywords[row].append(term)
+        return keywords
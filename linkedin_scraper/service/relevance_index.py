@@ -0,0 +1,247 @@
+import logging
+import os
+from typing import List, Sequence, Tuple
+
+import joblib
+import numpy as np
+from pymongo import UpdateOne
+from linkedin_scraper.metrics import timer
+from linkedin_scraper.service.keyword_model import build_vectorizer
+
+COURSE_PROJECTION = {"description": 1}
+JOB_PROJECTION = {"job_title": 1, "job_description": 1, "translated_description": 1}
+
+
+def job_text(job: dict) -> str:
+    # Translated descriptions share the courses' (English) vocabulary
+    return " ".join(filter(None, (job.get("job_title"), job.get("translated_description") or job.get("job_description"))))
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the column indices and values of the k largest entries of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64), np.empty((scores.shape[0], 0), dtype=scores.dtype)
+    indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+class RelevanceIndex:
+    """
+    Relates courses to jobs by the cosine similarity of their TF-IDF vectors over one vocabulary fitted on
+    both corpora. Jobs are scored against every course in blocks of block_size with one sparse matrix product
+    per block, keeping the top_k courses of each job and a running top_k jobs of each course. New jobs are
+    added incrementally against the stored course matrix; courses changing requires a rebuild. The index is
+    persisted to disk with joblib.
+    """
+
+    def __init__(self, path="relevance_index.joblib", top_k=10, block_size=1024, max_features=50000, min_df=2,
+                 max_df=0.8):
+        self.path = path
+        self.top_k = top_k
+        self.block_size = block_size
+        self.max_features = max_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.vectorizer = None
+        self.course_ids = []
+        self.course_rows = {}
+        self.course_matrix = None
+        self.job_ids = []
+        self.job_rows = {}
+        self.job_course_indices = np.empty((0, 0), dtype=np.int64)
+        self.job_course_scores = np.empty((0, 0), dtype=np.float32)
+        self.course_job_indices = np.empty((0, 0), dtype=np.int64)
+        self.course_job_scores = np.empty((0, 0), dtype=np.float32)
+
+    @property
+    def is_built(self) -> bool:
+        return self.vectorizer is not None
+
+    def fit(self, course_ids: Sequence, course_texts: List[str], job_ids: Sequence, job_texts: List[str]):
+        if not course_texts and not job_texts:
+            logging.warning("No course or job descriptions to fit the relevance index on, leaving it unbuilt")
+            return self
+        self.vectorizer = build_vectorizer(len(course_texts) + len(job_texts), self.max_features, self.min_df,
+                                           self.max_df)
+        with timer("relevance_fit"):
+            self.vectorizer.fit(list(course_texts) + list(job_texts))
+            self.course_matrix = self.vectorizer.transform(course_texts).tocsr()
+        self.course_ids = list(course_ids)
+        self.course_rows = {course_id: row for row, course_id in enumerate(self.course_ids)}
+
+        n_courses = len(self.course_ids)
+        k = min(self.top_k, n_courses)
+        self.job_ids = []
+        self.job_rows = {}
+        self.job_course_indices = np.empty((0, k), dtype=np.int64)
+        self.job_course_scores = np.empty((0, k), dtype=np.float32)
+        self.course_job_indices = np.full((n_courses, 0), -1, dtype=np.int64)
+        self.course_job_scores = np.empty((n_courses, 0), dtype=np.float32)
+        logging.info(f"Fitted relevance index vocabulary of {len(self.vectorizer.vocabulary_)} terms "
+                     f"on {n_courses} courses and {len(job_texts)} jobs")
+
+        self.add_jobs(job_ids, job_texts)
+        return self
+
+    def add_jobs(self, job_ids: Sequence, job_texts: List[str]) -> int:
+        """Scores jobs not yet in the index against every course; returns how many were added."""
+        new = [(job_id, text) for job_id, text in zip(job_ids, job_texts) if job_id not in self.job_rows]
+        if not new or not self.course_ids:
+            return 0
+
+        job_course_indices = [self.job_course_indices]
+        job_course_scores = [self.job_course_scores]
+        for start in range(0, len(new), self.block_size):
+            block = new[start:start + self.block_size]
+            offset = len(self.job_ids)
+
+            with timer("relevance_block"):
+                # Rows are L2 normalized, so the product holds cosine similarities (jobs x courses)
+                scores = self.vectorizer.transform([text for _, text in block]) @ self.course_matrix.T
+                scores = scores.toarray().astype(np.float32, copy=False)
+
+                indices, values = top_k_rows(scores, self.top_k)
+                job_course_indices.append(indices)
+                job_course_scores.append(values)
+
+                # Merge this block's best jobs for each course into the running top k
+                block_indices, block_values = top_k_rows(scores.T, self.top_k)
+                merged_indices = np.hstack([self.course_job_indices, block_indices + offset])
+                merged_values = np.hstack([self.course_job_scores, block_values])
+                keep, self.course_job_scores = top_k_rows(merged_values, self.top_k)
+                self.course_job_indices = np.take_along_axis(merged_indices, keep, axis=1)
+
+            for job_id, _ in block:
+                self.job_rows[job_id] = len(self.job_ids)
+                self.job_ids.append(job_id)
+
+        self.job_course_indices = np.vstack(job_course_indices)
+        self.job_course_scores = np.vstack(job_course_scores)
+        logging.info(f"Added {len(new)} jobs to the relevance index, {len(self.job_ids)} in total")
+        return len(new)
+
+    def courses_for_job(self, job_id, min_score: float = 0.0) -> List[Tuple[object, float]]:
+        row = self.job_rows.get(job_id)
+        if row is None:
+            return []
+        return [(self.course_ids[idx], float(score))
+                for idx, score in zip(self.job_course_indices[row], self.job_course_scores[row]) if score > min_score]
+
+    def jobs_for_course(self, course_id, min_score: float = 0.0) -> List[Tuple[object, float]]:
+        row = self.course_rows.get(course_id)
+        if row is None:
+            return []
+        return [(self.job_ids[idx], float(score))
+                for idx, score in zip(self.course_job_indices[row], self.course_job_scores[row]) if score > min_score]
+
+    def build_from_collections(self, courses_collection, jobs_collection, batch_size=1000):
+        courses = list(courses_collection.find({"description": {"$nin": [None, ""]}}, COURSE_PROJECTION,
+                                               batch_size=batch_size))
+        jobs = list(jobs_collection.find({"job_description": {"$nin": [None, ""]}, "is_duplicate": {"$ne": True}},
+                                         JOB_PROJECTION,
+                                         batch_size=batch_size).sort("_id", 1))
+        return self.fit([course["_id"] for course in courses], [course["description"] for course in courses],
+                        [job["_id"] for job in jobs], [job_text(job) for job in jobs])
+
+    def update_from_collection(self, jobs_collection, batch_size=1000) -> List:
+        """
+        Adds the stored jobs not yet in the index. New jobs are found by id rather than by ObjectId order,
+        which BulkWriter assigns when a job is queued, not when it is written.
+        """
+        query = {"job_description": {"$nin": [None, ""]}, "is_duplicate": {"$ne": True}}
+        new_ids = [job["_id"] for job in jobs_collection.find(query, {"_id": 1}, batch_size=10000)
+                   if job["_id"] not in self.job_rows]
+
+        added = []
+        for start in range(0, len(new_ids), batch_size):
+            batch = list(jobs_collection.find({"_id": {"$in": new_ids[start:start + batch_size]}}, JOB_PROJECTION,
+                                              batch_size=batch_size).sort("_id", 1))
+            self.add_jobs([job["_id"] for job in batch], [job_text(job) for job in batch])
+            added.extend(job["_id"] for job in batch)
+        return added
+
+    def write_matches(self, jobs_collection, courses_collection, job_ids=None, batch_size=1000):
+        """Stores relevant_courses on the given jobs (default: all) and relevant_jobs on every course."""
+        job_ids = self.job_ids if job_ids is None else job_ids
+        with timer("mongo_update"):
+            for start in range(0, len(job_ids), batch_size):
+                updates = [
+                    UpdateOne({"_id": job_id}, {"$set": {"relevant_courses": [
+                        {"course_id": course_id, "score": score} for course_id, score in self.courses_for_job(job_id)
+                    ]}})
+                    for job_id in job_ids[start:start + batch_size]
+                ]
+                if updates:
+                    jobs_collection.bulk_write(updates, ordered=False)
+
+            for start in range(0, len(self.course_ids), batch_size):
+                updates = [
+                    UpdateOne({"_id": course_id}, {"$set": {"relevant_jobs": [
+                        {"job_id": job_id, "score": score} for job_id, score in self.jobs_for_course(course_id)
+                    ]}})
+                    for course_id in self.course_ids[start:start + batch_size]
+                ]
+                if updates:
+                    courses_collection.bulk_write(updates, ordered=False)
+
+    def save(self):
+        joblib.dump({
+            "top_k": self.top_k,
+            "vectorizer": self.vectorizer,
+            "course_ids": self.course_ids,
+            "course_matrix": self.course_matrix,
+            "job_ids": self.job_ids,
+            "job_course_indices": self.job_course_indices,
+            "job_course_scores": self.job_course_scores,
+            "course_job_indices": self.course_job_indices,
+            "course_job_scores": self.course_job_scores,
+        }, self.path)
+        logging.info(f"Saved relevance index to {self.path}")
+
+    def load(self) -> bool:
+        if not os.path.isfile(self.path):
+            return False
+        state = joblib.load(self.path)
+        if state["top_k"] != self.top_k:
+            logging.info(f"Relevance index at {self.path} was built with a different top_k, rebuilding")
+            return False
+        self.vectorizer = state["vectorizer"]
+        self.course_ids = state["course_ids"]
+        self.course_rows = {course_id: row for row, course_id in enumerate(self.course_ids)}
+        self.course_matrix = state["course_matrix"]
+        self.job_ids = state["job_ids"]
+        self.job_rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        self.job_course_indices = state["job_course_indices"]
+        self.job_course_scores = state["job_course_scores"]
+        self.course_job_indices = state["course_job_indices"]
+        self.course_job_scores = state["course_job_scores"]
+        logging.info(f"Loaded relevance index of {len(self.course_ids)} courses and {len(self.job_ids)} jobs")
+        return True
+
+
+def update_relevance_index(config: dict, rebuild: bool = False) -> RelevanceIndex:
+    """Builds the index on first use (or when rebuild is set), otherwise adds the stored jobs not yet indexed."""
+    from linkedin_scraper.mongo_client import get_database
+
+    index_config = config.get("relevance_index", {})
+    index = RelevanceIndex(
+        index_config.get("path", "relevance_index.joblib"),
+        top_k=index_config.get("top_k", 10),
+        block_size=index_config.get("block_size", 1024),
+    )
+    db = get_database()
+    if rebuild or not index.load():
+        index.build_from_collections(db["courses"], db["jobs"])
+        updated_jobs = None
+    else:
+        updated_jobs = index.update_from_collection(db["jobs"])
+    if not index.is_built:
+        return index
+    index.save()
+
+    if index_config.get("write_to_mongo", False):
+        index.write_matches(db["jobs"], db["courses"], job_ids=updated_jobs)
+    return index
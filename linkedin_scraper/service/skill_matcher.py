@@ -0,0 +1,50 @@
+import hashlib
+import logging
+import os
+
+import spacy
+import yaml
+from spacy.language import Language
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "skills.yaml")
+
+
+def load_taxonomy(taxonomy_path=DEFAULT_TAXONOMY_PATH) -> dict:
+    with open(taxonomy_path) as file:
+        return yaml.safe_load(file)
+
+
+def is_case_sensitive(term: str) -> bool:
+    # Short single words collide with ordinary English ("go", "r", "react") unless matched exactly
+    return " " not in term and len(term) <= 5
+
+
+def build_skill_pipeline(taxonomy_path=DEFAULT_TAXONOMY_PATH, cache_dir="skill_pipeline") -> Language:
+    """
+    Builds a tokenizer-only spaCy pipeline whose EntityRulers label every taxonomy term with PhraseMatcher
+    passes instead of the statistical NER. The compiled pipeline is saved under cache_dir keyed by the
+    taxonomy's hash, so later runs load it instead of rebuilding and editing the taxonomy invalidates it.
+    """
+    with open(taxonomy_path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    cached_path = os.path.join(cache_dir, digest)
+    if os.path.isdir(cached_path):
+        logging.info(f"Loading compiled skill pipeline from {cached_path}")
+        return spacy.load(cached_path)
+
+    nlp = spacy.blank("en")
+    case_insensitive_ruler = nlp.add_pipe("entity_ruler", name="skill_ruler", config={"phrase_matcher_attr": "LOWER"})
+    case_sensitive_ruler = nlp.add_pipe("entity_ruler", name="cased_skill_ruler")
+    patterns = [
+        {"label": label, "pattern": str(term)}
+        for label, terms in load_taxonomy(taxonomy_path).items()
+        for term in terms
+    ]
+    case_insensitive_ruler.add_patterns([p for p in patterns if not is_case_sensitive(p["pattern"])])
+    case_sensitive_ruler.add_patterns([p for p in patterns if is_case_sensitive(p["pattern"])])
+
+    nlp.to_disk(cached_path)
+    logging.info(
+        f"Compiled {len(case_insensitive_ruler) + len(case_sensitive_ruler)} skill patterns to {cached_path}"
+    )
+    return nlp
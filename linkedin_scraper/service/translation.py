@@ -0,0 +1,109 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from googletrans import Translator
+
+
+class TranslatorBackend:
+    """Interface for translating job descriptions; swap implementations to avoid network calls."""
+    # Whether translations from this backend may be stored in the shared TranslationCache
+    cache_translations = True
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    def __init__(self):
+        self.translator = Translator()
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        return self.translator.translate(text, src=src, dest=dest).text
+
+
+class NoopTranslatorBackend(TranslatorBackend):
+    """Offline stand-in that returns text unchanged, for tests and runs without network access."""
+    # Its "translations" are the untranslated text, which must not be served to later translating runs
+    cache_translations = False
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        return text
+
+
+TRANSLATOR_BACKENDS = {
+    "GOOGLE": GoogleTranslatorBackend,
+    "NONE": NoopTranslatorBackend,
+}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Persists the detected language and translated text of each description keyed by its content hash, so
+    reposted descriptions are never detected or translated twice. Least recently used entries are evicted
+    once the cache holds more than max_entries, checked every EVICTION_INTERVAL writes.
+    """
+    EVICTION_INTERVAL = 1000
+
+    def __init__(self, path: str = "translation_cache.db", max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.puts_since_eviction = 0
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                hash TEXT PRIMARY KEY,
+                language TEXT,
+                translated_text TEXT NOT NULL,
+                last_used TEXT NOT NULL
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self.connection.commit()
+
+    def close(self):
+        self.evict()
+        self.connection.close()
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Returns (language, translated_text) for a content hash, or None on a miss."""
+        row = self.connection.execute(
+            "SELECT language, translated_text FROM translations WHERE hash = ?", (key,)
+        ).fetchone()
+        if row:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE translations SET last_used = ? WHERE hash = ?",
+                    (datetime.now(timezone.utc).isoformat(), key),
+                )
+        return row
+
+    def put(self, key: str, language: str, translated_text: str):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                (key, language, translated_text, datetime.now(timezone.utc).isoformat()),
+            )
+        self.puts_since_eviction += 1
+        if self.puts_since_eviction >= self.EVICTION_INTERVAL:
+            self.evict()
+
+    def evict(self):
+        self.puts_since_eviction = 0
+        with self.connection:
+            self.connection.execute(
+                """
+                DELETE FROM translations WHERE hash IN (
+                    SELECT hash FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from linkedin_scraper.bulk_writer import BulkWriter
+from linkedin_scraper.frontier import DONE, FAILED, DoneOnFlush, Frontier
+
+
+class InsertResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class FakeCollection:
+    name = "jobs"
+
+    def __init__(self, error=None):
+        self.documents = []
+        self.error = error
+
+    def insert_many(self, documents, ordered=True):
+        if self.error:
+            raise self.error
+        self.documents.extend(documents)
+        return InsertResult([document["_id"] for document in documents])
+
+
+class DoneOnFlushTest(unittest.TestCase):
+    """Saves jobs the way JobRunner does, with a writer that flushes on every add."""
+
+    queue = "jobs:q"
+    keys = ["job-1", "job-2", "job-3"]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.frontier = Frontier(os.path.join(directory.name, "frontier.db"))
+        self.frontier.reset(self.queue, ((key, {"linkedin_url": key}) for key in self.keys))
+        self.flushed_jobs = DoneOnFlush(self.frontier)
+
+    def tearDown(self):
+        self.frontier.close()
+
+    def save(self, writer):
+        for key in self.keys:
+            document = {"_id": ObjectId(), "linkedin_url": key}
+            # Registered before add(), which flushes the document straight away
+            self.flushed_jobs.add(self.queue, key, [document["_id"]])
+            try:
+                writer.add(document)
+            except AutoReconnect:
+                self.flushed_jobs.discard(self.queue, key)
+
+    def close(self, writer):
+        writer.flush()
+        self.flushed_jobs.flushed(writer.errors)
+
+    def statuses(self):
+        rows = self.frontier.connection.execute("SELECT key, status FROM frontier WHERE queue = ?", (self.queue,))
+        return dict(rows.fetchall())
+
+    def test_every_item_is_done_after_the_final_flush(self):
+        collection = FakeCollection()
+        writer = BulkWriter(collection, flush_interval=0,
+                            on_flush=lambda documents: self.flushed_jobs.flushed(writer.errors))
+        self.save(writer)
+        # Each add() flushed, so the last job is done even though closing finds an empty buffer
+        self.assertEqual(self.frontier.pending(self.queue), [])
+        self.close(writer)
+        self.assertEqual(len(collection.documents), len(self.keys))
+        self.assertEqual(self.statuses(), {key: DONE for key in self.keys})
+
+    def test_items_of_a_failed_batch_are_marked_failed(self):
+        writer = BulkWriter(FakeCollection(AutoReconnect("unreachable")), flush_interval=0,
+                            on_flush=lambda documents: self.flushed_jobs.flushed(writer.errors))
+        self.save(writer)
+        self.close(writer)
+        self.assertEqual(len(writer.errors), len(self.keys))
+        self.assertEqual(self.statuses(), {key: FAILED for key in self.keys})
+
+
+if __name__ == "__main__":
+    unittest.main()